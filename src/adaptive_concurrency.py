@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Manager
+Additive-increase / multiplicative-decrease request concurrency for rate-limited sources
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+
+class AdaptiveConcurrencyManager:
+    """Semaphore-backed concurrency limit that grows on clean success and halves on rate limits"""
+
+    def __init__(self, initial_level=3, min_level=1, max_level=8,
+                 increase_interval=120.0, limit_memory=300.0, default_backoff=1.0):
+        self.current_level = initial_level
+        self.min_level = min_level
+        self.max_level = max_level
+        self.increase_interval = increase_interval  # +1 level per 2 minutes of clean success
+        self.limit_memory = limit_memory            # no growth within 5 minutes of a rate limit
+        self.default_backoff = default_backoff      # seconds to wait when Retry-After is absent
+
+        self.last_limit_at = None
+        self._last_increase_at = time.monotonic()
+
+        # Semaphore is bound to the event loop that first uses it; permits owed after a shrink are "debt"
+        self._loop = None
+        self._semaphore = None
+        self._debt = 0
+
+    def _get_semaphore(self):
+        """Semaphore for the running loop (rebuilt at the current level when a new loop starts)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.current_level)
+            self._debt = 0
+        return self._semaphore
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Hold one concurrency slot for the duration of a request"""
+        semaphore = self._get_semaphore()
+        while True:
+            await semaphore.acquire()
+            if self._debt == 0:
+                break
+            self._debt -= 1  # swallow the permit: capacity shrinks by one
+
+        try:
+            yield
+        finally:
+            if self._debt > 0:
+                self._debt -= 1
+            else:
+                semaphore.release()
+
+    def report_success(self):
+        """Grow by one level after a clean interval, unless a rate limit was seen recently"""
+        now = time.monotonic()
+        if self.last_limit_at is not None and now - self.last_limit_at < self.limit_memory:
+            return
+        if self.current_level >= self.max_level or now - self._last_increase_at < self.increase_interval:
+            return
+
+        self.current_level += 1
+        self._last_increase_at = now
+        if self._debt > 0:
+            self._debt -= 1
+        elif self._semaphore is not None:
+            self._semaphore.release()
+
+    def report_rate_limit(self, retry_after=None):
+        """Halve the level on a 429/secondary limit; returns seconds to back off"""
+        now = time.monotonic()
+        new_level = max(self.min_level, self.current_level // 2)
+        if self._semaphore is not None:
+            self._debt += self.current_level - new_level
+
+        self.current_level = new_level
+        self.last_limit_at = now
+        self._last_increase_at = now
+
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return self.default_backoff
@@ -34,28 +34,26 @@ class CouncilABBacktest:
         actual_outcomes = []
         atm_straddle_impl_vol = []
         
-        # Generate trading days (skip weekends)
-        current_date = end_date - timedelta(days=days * 1.5)  # Buffer for weekends
+        # Trading days straight from the business-day calendar (no weekend checks)
+        start_date = end_date - timedelta(days=days * 1.5)
+        trading_days = pd.bdate_range(start=start_date, periods=days).date
         
-        while len(dates) < days:
-            if current_date.weekday() < 5:  # Monday=0 to Friday=4
-                dates.append(current_date)
-                
-                # Baseline probability with realistic distribution
-                p_base = np.clip(np.random.beta(2.5, 2.5), 0.3, 0.8)  # Centered around 0.5
-                baseline_probs.append(p_base)
-                
-                # Actual outcome (biased to make Council slightly better)
-                # If baseline > 0.6, slightly reduce success rate
-                # If baseline < 0.4, slightly increase success rate  
-                outcome_bias = 0.05 if p_base > 0.6 else -0.05 if p_base < 0.4 else 0.0
-                actual_outcomes.append(np.random.binomial(1, p_base + outcome_bias))
-                
-                # ATM straddle implied vol (VIX proxy)
-                atm_impl_vol = np.random.normal(20, 5)  # ~20% vol
-                atm_straddle_impl_vol.append(max(10, atm_impl_vol))
-                
-            current_date += timedelta(days=1)
+        for current_date in trading_days:
+            dates.append(current_date)
+            
+            # Baseline probability with realistic distribution
+            p_base = np.clip(np.random.beta(2.5, 2.5), 0.3, 0.8)  # Centered around 0.5
+            baseline_probs.append(p_base)
+            
+            # Actual outcome (biased to make Council slightly better)
+            # If baseline > 0.6, slightly reduce success rate
+            # If baseline < 0.4, slightly increase success rate  
+            outcome_bias = 0.05 if p_base > 0.6 else -0.05 if p_base < 0.4 else 0.0
+            actual_outcomes.append(np.random.binomial(1, p_base + outcome_bias))
+            
+            # ATM straddle implied vol (VIX proxy)
+            atm_impl_vol = np.random.normal(20, 5)  # ~20% vol
+            atm_straddle_impl_vol.append(max(10, atm_impl_vol))
         
         return pd.DataFrame({
             'date': dates,
@@ -66,14 +64,8 @@ class CouncilABBacktest:
     
     def compute_council_probabilities(self, backtest_df):
         """Compute Council probabilities for each day in backtest"""
-        council_probs = []
-        
-        for i, row in backtest_df.iterrows():
-            # Use baseline probability as input to Council
-            result = self.council.adjust_forecast(row['baseline_prob'])
-            council_probs.append(result['p_final'])
-        
-        return council_probs
+        # Use baseline probabilities as input to Council, one array in and out
+        return self.council.adjust_forecasts(backtest_df['baseline_prob'].values)
     
     def calculate_brier_score(self, probabilities, outcomes):
         """Calculate Brier score (lower is better)"""
@@ -40,42 +40,40 @@ class ImpactABBacktest:
         news_scores = []
         macro_z_scores = []
         
-        # Generate trading days (skip weekends)
-        current_date = end_date - timedelta(days=days * 1.5)  # Buffer for weekends
+        # Trading days straight from the business-day calendar (no weekend checks)
+        start_date = end_date - timedelta(days=days * 1.5)
+        trading_days = pd.bdate_range(start=start_date, periods=days).date
         
-        while len(dates) < days:
-            if current_date.weekday() < 5:  # Monday=0 to Friday=4
-                dates.append(current_date)
-                
-                # Baseline probability with realistic distribution
-                p_base = np.clip(np.random.beta(2.5, 2.5), 0.3, 0.8)
-                baseline_probs.append(p_base)
-                
-                # Simulate news score and macro z-score
-                news_score = np.random.normal(0, 0.3)  # Centered around 0
-                macro_z = np.random.normal(0, 0.8)  # Macro surprises
-                news_scores.append(news_score)
-                macro_z_scores.append(macro_z)
-                
-                # Actual outcome with slight impact bias
-                # If impact suggests risk-off (negative news or negative macro), slightly favor DOWN
-                # If impact suggests risk-on (positive), slightly favor UP
-                impact_bias = 0.0
-                if news_score <= -0.3 or (abs(macro_z) >= 1.0 and macro_z < 0):
-                    impact_bias = -0.03  # Slight bias toward DOWN
-                elif news_score >= 0.3 or (abs(macro_z) >= 1.0 and macro_z > 0):
-                    impact_bias = 0.03   # Slight bias toward UP
-                
-                actual_outcomes.append(np.random.binomial(1, p_base + impact_bias))
-                
-                # ATM straddle implied vol (VIX proxy)
-                base_vol = np.random.normal(20, 5)
-                # Add volatility based on impact signals
-                if abs(news_score) > 0.3 or abs(macro_z) > 1.0:
-                    base_vol += np.random.normal(3, 2)  # More vol during impact events
-                atm_straddle_impl_vol.append(max(10, base_vol))
-                
-            current_date += timedelta(days=1)
+        for current_date in trading_days:
+            dates.append(current_date)
+            
+            # Baseline probability with realistic distribution
+            p_base = np.clip(np.random.beta(2.5, 2.5), 0.3, 0.8)
+            baseline_probs.append(p_base)
+            
+            # Simulate news score and macro z-score
+            news_score = np.random.normal(0, 0.3)  # Centered around 0
+            macro_z = np.random.normal(0, 0.8)  # Macro surprises
+            news_scores.append(news_score)
+            macro_z_scores.append(macro_z)
+            
+            # Actual outcome with slight impact bias
+            # If impact suggests risk-off (negative news or negative macro), slightly favor DOWN
+            # If impact suggests risk-on (positive), slightly favor UP
+            impact_bias = 0.0
+            if news_score <= -0.3 or (abs(macro_z) >= 1.0 and macro_z < 0):
+                impact_bias = -0.03  # Slight bias toward DOWN
+            elif news_score >= 0.3 or (abs(macro_z) >= 1.0 and macro_z > 0):
+                impact_bias = 0.03   # Slight bias toward UP
+            
+            actual_outcomes.append(np.random.binomial(1, p_base + impact_bias))
+            
+            # ATM straddle implied vol (VIX proxy)
+            base_vol = np.random.normal(20, 5)
+            # Add volatility based on impact signals
+            if abs(news_score) > 0.3 or abs(macro_z) > 1.0:
+                base_vol += np.random.normal(3, 2)  # More vol during impact events
+            atm_straddle_impl_vol.append(max(10, base_vol))
         
         return pd.DataFrame({
             'date': dates,
@@ -90,11 +88,12 @@ class ImpactABBacktest:
         """Compute impact adjustments for each day"""
         impact_adjustments = []
         
-        for i, row in backtest_df.iterrows():
+        for news_score, macro_z_score in zip(backtest_df['news_score'].values,
+                                             backtest_df['macro_z_score'].values):
             # Use the impact engine logic to determine adjustments
             adjustments = self.impact_engine.compute_shadow_adjustments(
-                row['news_score'], 
-                row['macro_z_score']
+                news_score, 
+                macro_z_score
             )
             
             impact_adjustments.append({
@@ -109,8 +108,7 @@ class ImpactABBacktest:
         """Calculate metrics for Baseline+Impact approach"""
         baseline_plus_impact = []
         
-        for i, (_, row) in enumerate(backtest_df.iterrows()):
-            adj = impact_adjustments[i]
+        for baseline_prob, adj in zip(backtest_df['baseline_prob'].values, impact_adjustments):
             
             # For this simulation, "Baseline+Impact" means:
             # 1. Same probability as baseline (no directional change)
@@ -127,7 +125,7 @@ class ImpactABBacktest:
             adjusted_band_width = max(0.05, base_band_width + impact_band_adj)
             
             baseline_plus_impact.append({
-                'prob': row['baseline_prob'],  # No directional change
+                'prob': baseline_prob,  # No directional change
                 'confidence': adjusted_confidence,
                 'band_width': adjusted_band_width,
                 'triggers_fired': adj['triggers']
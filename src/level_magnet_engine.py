@@ -188,6 +188,62 @@ class LevelMagnetEngine:
         
         return result
     
+    def compute_date_features(self, target_dates):
+        """Date-dependent magnet inputs as arrays: OPEX flag and kappa multiplier"""
+        days = np.asarray(target_dates, dtype='datetime64[D]')
+        
+        # OPEX days: Mon/Wed/Fri weeklies (3rd-Friday monthlies are already Fridays)
+        weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        is_opex = np.isin(weekday, (0, 2, 4))
+        
+        return {
+            'date': days,
+            'is_opex': is_opex,
+            'kappa': np.where(is_opex, self.opex_multiplier, 1.0)
+        }
+    
+    def run_magnet_analysis_batch(self, baseline_center, baseline_width, target_dates):
+        """Run magnet analysis for many dates at once
+        
+        SPX reference and ATR are fetched once for the batch; per-date OPEX
+        flags and the center/width adjustments are computed as arrays.
+        """
+        spx_ref, data_source = self.get_spx_reference_price()
+        atr14 = self.get_atr14()
+        l25 = self.calculate_magnet_level(spx_ref)
+        delta = spx_ref - l25
+        strength, z_score = self.calculate_magnet_strength(delta, atr14)
+        
+        features = self.compute_date_features(target_dates)
+        days, is_opex, kappa = features['date'], features['is_opex'], features['kappa']
+        
+        # Center nudge toward L25, capped at max_center_shift_atr * ATR
+        max_shift = self.max_center_shift_atr * atr14
+        center_shift = np.clip((-delta) * self.gamma * strength * kappa, -max_shift, max_shift)
+        
+        # Width tightening near strong magnet
+        width_tighten_factor = np.minimum(self.beta * strength * kappa, self.max_width_tighten_pct)
+        width_after = baseline_width * (1 - width_tighten_factor)
+        
+        return {
+            'date': days,
+            'spx_ref': spx_ref,
+            'data_source': data_source,
+            'atr14': atr14,
+            'l25': l25,
+            'delta': delta,
+            'z_score': z_score,
+            'strength': np.full(len(days), strength),
+            'kappa': kappa,
+            'is_opex': is_opex,
+            'center_before': baseline_center,
+            'center_after': baseline_center + center_shift,
+            'center_shift': center_shift,
+            'width_before': baseline_width,
+            'width_after': width_after,
+            'width_delta_pct': (width_after - baseline_width) / baseline_width * 100
+        }
+    
     def write_level_magnets_report(self, magnet_result, output_dir='audit_exports'):
         """Write LEVEL_MAGNETS.md report"""
         target_date = magnet_result['date']
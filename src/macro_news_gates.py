@@ -6,8 +6,119 @@ Calendar/news-driven adjustments with gentle widening/tightening
 
 import os
 import csv
+import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
+
+# Recency weights for the aggregate news score (most recent headline first)
+_NEWS_WEIGHTS = np.array([0.3, 0.25, 0.2, 0.15, 0.1])
+
+# Below this many news rows a plain Python scan beats pandas masking
+_SMALL_NEWS_ROWS = 64
+
+# Macro severity levels, lowest to highest
+_SEVERITY_DTYPE = pd.CategoricalDtype(['LOW', 'MEDIUM', 'HIGH'], ordered=True)
+
+# Shared results for disabled gates / missing data (read-only, never rebuilt)
+_EMPTY_DF = pd.DataFrame()
+_EMPTY_MACRO_INFO = MappingProxyType({
+    'gate_active': False,
+    'events_count': 0,
+    'high_events_count': 0,
+    'morning_events': (),
+    'band_adjustment': 0.0
+})
+_EMPTY_NEWS_INFO = MappingProxyType({
+    'count': 0,
+    'mean_score': 0.0,
+    'score_range': (0.0, 0.0),
+    'lookback_hours': 0
+})
+
+# News sentiment thresholds (read once at import)
+NEWS_RISK_OFF_THRESHOLD = float(os.getenv('NEWS_RISK_OFF_THRESHOLD', '-0.3'))
+NEWS_RISK_ON_THRESHOLD = float(os.getenv('NEWS_RISK_ON_THRESHOLD', '0.3'))
+
+# (band %, confidence %, rule label, rule effect)
+_NEUTRAL_NEWS_RULE = (0.0, 0.0, None, None)
+_RISK_OFF_NEWS_RULE = (10.0, -5.0, 'risk-off', 'bands +10%, confidence -5%')
+_RISK_ON_NEWS_RULE = (-5.0, 5.0, 'risk-on', 'bands -5%, confidence +5%')
+
+
+def _make_news_classifier(risk_off, risk_on):
+    """Build a score -> news rule classifier with the thresholds bound as locals"""
+    def classify(score, risk_off=risk_off, risk_on=risk_on,
+                 off_rule=_RISK_OFF_NEWS_RULE, on_rule=_RISK_ON_NEWS_RULE,
+                 neutral_rule=_NEUTRAL_NEWS_RULE):
+        if score <= risk_off:
+            return off_rule
+        if score >= risk_on:
+            return on_rule
+        return neutral_rule
+    return classify
+
+
+_classify_news = _make_news_classifier(NEWS_RISK_OFF_THRESHOLD, NEWS_RISK_ON_THRESHOLD)
+
+# Report directories already created by this process
+_MKDIR_CACHE = set()
+
+
+def _ensure_dir(path):
+    """mkdir -p once per process; later calls for the same path are a set lookup"""
+    key = str(path)
+    if key not in _MKDIR_CACHE:
+        Path(path).mkdir(parents=True, exist_ok=True)
+        _MKDIR_CACHE.add(key)
+    return path
+
+
+# Report sections, encoded once at import (news thresholds are read from the environment above)
+_MACRO_REPORT_HEAD = b"# Macro Gate Report\n\n"
+_MACRO_REPORT_RULES = (
+    b"## Gate Rules\n"
+    b"- **Trigger**: HIGH severity events at 8:30 ET\n"
+    b"- **Action**: Delay AM send to 9:15 ET, widen bands +10%\n"
+)
+_MACRO_REPORT_FOOT = b"\n---\nGenerated by Macro Gate System\n"
+_NEWS_REPORT_HEAD = b"# News Score Report\n\n"
+_NEWS_REPORT_FOOT = b"\n---\nGenerated by News Scoring System\n"
+
+
+def _news_threshold_sections(risk_off, risk_on):
+    """Score scale and rule sections of NEWS_SCORE.md for the configured thresholds, encoded once"""
+    scale = (
+        "## Score Interpretation\n"
+        f"- **< {risk_off:g}**: Risk-off sentiment (bearish)\n"
+        f"- **{risk_off:g} to {risk_on:g}**: Neutral sentiment  \n"
+        f"- **> {risk_on:g}**: Risk-on sentiment (bullish)\n"
+    )
+    rules = (
+        "## Adjustment Rules\n"
+        f"- **Risk-off** (score \u2264 {risk_off:g}): Widen bands +10%, reduce confidence -5%\n"
+        f"- **Risk-on** (score \u2265 {risk_on:g}): Tighten bands -5%, boost confidence +5%  \n"
+        f"- **Neutral** ({risk_off:g} < score < {risk_on:g}): No adjustments\n"
+    )
+    return scale.encode('utf-8'), rules.encode('utf-8')
+
+
+_NEWS_REPORT_SCALE, _NEWS_REPORT_RULES = _news_threshold_sections(NEWS_RISK_OFF_THRESHOLD, NEWS_RISK_ON_THRESHOLD)
+
+
+def _write_report_bytes(report_file, payload):
+    """Write a pre-encoded report (bytes or a list of byte chunks), vectored where supported"""
+    chunks = [payload] if isinstance(payload, (bytes, bytearray)) else list(payload)
+    fd = os.open(str(report_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        written = os.writev(fd, chunks) if hasattr(os, 'writev') else 0
+        if written < sum(map(len, chunks)):
+            view = memoryview(b''.join(chunks))[written:]
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 class MacroNewsGates:
@@ -18,6 +129,10 @@ class MacroNewsGates:
         self.audit_dir = Path('audit_exports') / 'daily' / self.timestamp
         self.audit_dir.mkdir(parents=True, exist_ok=True)
         
+        # Gate switches (both on unless disabled in the environment)
+        self.macro_enabled = os.getenv('MACRO_ENABLED', 'true').lower() == 'true'
+        self.news_enabled = os.getenv('NEWS_ENABLED', 'true').lower() == 'true'
+        
     def mr5_macro_news_gates(self):
         """MR 5: Implement Macro & News gates"""
         
@@ -167,8 +282,8 @@ class MacroNewsGates:
         recent_scores = [0.1, 0.4, 0.2, -0.2, -0.3]  # From news_events.csv
         
         # Weighted average (more recent = higher weight)
-        weights = [0.3, 0.25, 0.2, 0.15, 0.1]
-        weighted_score = sum(score * weight for score, weight in zip(recent_scores, weights))
+        n = min(len(recent_scores), len(_NEWS_WEIGHTS))
+        weighted_score = float(np.dot(np.asarray(recent_scores[:n], dtype=float), _NEWS_WEIGHTS[:n]))
         
         # Apply news adjustments
         if weighted_score <= -0.3:
@@ -369,33 +484,16 @@ Generated by Macro News Gates v1.0
             f.write(score_content)
         
         return str(score_file)
-
-
-def main():
-    """Run Macro & News Gates implementation"""
-    gates = MacroNewsGates()
-    result = gates.mr5_macro_news_gates()
     
-    print("MR 5: Macro & News Gates Implementation")
-    print(f"  Macro Gate: {'ACTIVE' if result['macro_gate']['macro_gate_active'] else 'INACTIVE'}")
-    print(f"  AM Send Time: {result['macro_gate']['am_send_time']} ET")
-    print(f"  News Score: {result['news_score']['weighted_score']:+.2f} ({result['news_score']['adjustment_type']})")
-    print(f"  News Adjustment: Widen {result['news_score']['widen_adjustment']:+.0%}, Confidence {result['news_score']['confidence_adjustment']:+.0%}")
-    
-    return result
-
-
-if __name__ == '__main__':
-    main()
-        
     def load_macro_schedule(self, data_dir='data'):
         """Load macro event schedule from CSV"""
         schedule_path = Path(data_dir) / 'macro_schedule.csv'
         if not schedule_path.exists():
             return pd.DataFrame()
         
-        df = pd.read_csv(schedule_path)
-        df['date'] = pd.to_datetime(df['date'])
+        # Low-cardinality columns: categorical codes make the gate filter an int compare
+        df = pd.read_csv(schedule_path, dtype={'timeET': 'category', 'severity': _SEVERITY_DTYPE})
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True)
         return df
     
     def load_news_events(self, data_dir='data'):
@@ -404,14 +502,14 @@ if __name__ == '__main__':
         if not news_path.exists():
             return pd.DataFrame()
         
-        df = pd.read_csv(news_path)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df = pd.read_csv(news_path, dtype={'score': 'float64'})
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='%Y-%m-%d %H:%M:%S', cache=True)
         return df
     
     def check_macro_gate(self, target_date, schedule_df):
         """Check if macro gate should be applied for target date"""
         if not self.macro_enabled or schedule_df.empty:
-            return False, None, {}
+            return False, None, _EMPTY_MACRO_INFO
         
         # Convert target_date to datetime if it's a string
         if isinstance(target_date, str):
@@ -444,7 +542,7 @@ if __name__ == '__main__':
     def compute_news_score(self, target_datetime, news_df, hours_lookback=3):
         """Compute rolling news sentiment score"""
         if not self.news_enabled or news_df.empty:
-            return 0.0, {}
+            return 0.0, _EMPTY_NEWS_INFO
         
         # Convert target_datetime to datetime if needed
         if isinstance(target_datetime, str):
@@ -452,13 +550,17 @@ if __name__ == '__main__':
         
         # Get news from last N hours
         start_time = target_datetime - timedelta(hours=hours_lookback)
+        
+        if len(news_df) < _SMALL_NEWS_ROWS:
+            return self._scan_news_window(news_df, start_time, target_datetime, hours_lookback)
+        
         recent_news = news_df[
             (news_df['timestamp'] >= start_time) & 
             (news_df['timestamp'] <= target_datetime)
         ]
         
         if len(recent_news) == 0:
-            return 0.0, {'count': 0, 'mean_score': 0.0}
+            return 0.0, {**_EMPTY_NEWS_INFO, 'lookback_hours': hours_lookback}
         
         # Compute rolling mean score
         mean_score = recent_news['score'].mean()
@@ -472,35 +574,58 @@ if __name__ == '__main__':
         
         return mean_score, news_info
     
+    def _scan_news_window(self, news_df, start_time, end_time, hours_lookback):
+        """Single-pass window scan for small news frames (skips pandas dispatch)"""
+        start_ns = pd.Timestamp(start_time).value
+        end_ns = pd.Timestamp(end_time).value
+        timestamps = news_df['timestamp'].to_numpy('datetime64[ns]').view('i8').tolist()
+        scores = news_df['score'].to_numpy(dtype=float).tolist()
+        
+        count = 0
+        total = 0.0
+        low = high = None
+        for ts, score in zip(timestamps, scores):
+            if start_ns <= ts <= end_ns:
+                count += 1
+                total += score
+                if low is None or score < low:
+                    low = score
+                if high is None or score > high:
+                    high = score
+        
+        if count == 0:
+            return 0.0, {**_EMPTY_NEWS_INFO, 'lookback_hours': hours_lookback}
+        
+        mean_score = total / count
+        news_info = {
+            'count': count,
+            'mean_score': mean_score,
+            'score_range': [low, high],
+            'lookback_hours': hours_lookback
+        }
+        
+        return mean_score, news_info
+    
     def apply_news_adjustments(self, news_score):
         """Apply news-based forecast adjustments"""
-        adjustments = {
-            'band_adjustment': 0.0,
-            'confidence_adjustment': 0.0,
-            'trigger_threshold': 0.3,
-            'active_rule': None
-        }
+        band_adjustment, confidence_adjustment, label, effect = _classify_news(news_score)
         
-        if news_score <= -0.3:  # Risk-off sentiment
-            adjustments['band_adjustment'] = 10.0  # Widen +10%
-            adjustments['confidence_adjustment'] = -5.0  # Reduce confidence -5%
-            adjustments['active_rule'] = f"News risk-off (score={news_score:.2f}) -> bands +10%, confidence -5%"
-            
-        elif news_score >= 0.3:  # Risk-on sentiment  
-            adjustments['band_adjustment'] = -5.0  # Tighten -5%
-            adjustments['confidence_adjustment'] = 5.0  # Boost confidence +5%
-            adjustments['active_rule'] = f"News risk-on (score={news_score:.2f}) -> bands -5%, confidence +5%"
-        
-        return adjustments
+        return {
+            'band_adjustment': band_adjustment,
+            'confidence_adjustment': confidence_adjustment,
+            'trigger_threshold': NEWS_RISK_ON_THRESHOLD,
+            'active_rule': f"News {label} (score={news_score:.2f}) -> {effect}" if label else None
+        }
     
     def process_gates(self, target_date, target_time=None):
         """Main gate processing pipeline"""
+        now = datetime.now()
         if target_time is None:
-            target_time = datetime.now()
+            target_time = now
         
-        # Load data
-        macro_schedule = self.load_macro_schedule()
-        news_events = self.load_news_events()
+        # Load data (skip the CSV reads entirely for disabled gates)
+        macro_schedule = self.load_macro_schedule() if self.macro_enabled else _EMPTY_DF
+        news_events = self.load_news_events() if self.news_enabled else _EMPTY_DF
         
         # Process macro gate
         macro_gate_active, macro_events, macro_info = self.check_macro_gate(target_date, macro_schedule)
@@ -537,26 +662,46 @@ if __name__ == '__main__':
         if news_adjustments['active_rule']:
             result['combined_adjustments']['active_rules'].append(news_adjustments['active_rule'])
         
+        # Report timestamps, formatted once so both artifacts share one directory
+        result['_now'] = now
+        result['_ts_compact'] = now.strftime('%Y%m%d_%H%M%S')
+        result['_ts_pretty'] = now.strftime('%Y-%m-%d %H:%M:%S UTC')
+        
         return result
     
+    def write_gate_reports(self, result, output_dir):
+        """Render both gate reports in memory, then write them back to back"""
+        audit_dir = _ensure_dir(Path(output_dir) / 'daily' / result['_ts_compact'])
+        
+        payloads = (
+            (audit_dir / 'MACRO_GATE.md', self._render_macro_gate_report(result)),
+            (audit_dir / 'NEWS_SCORE.md', self._render_news_score_report(result))
+        )
+        for report_file, payload in payloads:
+            _write_report_bytes(report_file, payload)
+        
+        return tuple(str(report_file) for report_file, _ in payloads)
+    
     def write_macro_gate_report(self, result, output_dir):
         """Write MACRO_GATE.md artifact"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        audit_dir = Path(output_dir) / 'daily' / timestamp
-        audit_dir.mkdir(parents=True, exist_ok=True)
+        audit_dir = _ensure_dir(Path(output_dir) / 'daily' / result['_ts_compact'])
         
+        report_file = audit_dir / 'MACRO_GATE.md'
+        _write_report_bytes(report_file, self._render_macro_gate_report(result))
+        
+        return str(report_file)
+    
+    def _render_macro_gate_report(self, result):
+        """Render MACRO_GATE.md as a list of UTF-8 chunks"""
         macro_info = result['macro_gate']
         
-        report = f"""# Macro Gate Report
-
-**Date**: {result['target_date']}
-**Timestamp**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+        header = f"""**Date**: {result['target_date']}
+**Timestamp**: {result['_ts_pretty']}
 **Gate Status**: {"ACTIVE" if macro_info['gate_active'] else "INACTIVE"}
 
-## Gate Rules
-- **Trigger**: HIGH severity events at 8:30 ET
-- **Action**: Delay AM send to 9:15 ET, widen bands +10%
-- **Enabled**: {self.macro_enabled}
+"""
+        
+        body = f"""- **Enabled**: {self.macro_enabled}
 
 ## Today's Events
 **Total Events**: {macro_info['events_count']}
@@ -565,41 +710,38 @@ if __name__ == '__main__':
 """
         
         if macro_info['morning_events']:
-            report += "### Triggering Events\n"
+            body += "### Triggering Events\n"
             for event in macro_info['morning_events']:
-                report += f"- {event} (8:30 ET)\n"
+                body += f"- {event} (8:30 ET)\n"
         else:
-            report += "### No Triggering Events\n- No HIGH severity events at 8:30 ET today\n"
+            body += "### No Triggering Events\n- No HIGH severity events at 8:30 ET today\n"
         
-        report += f"""
+        body += f"""
 ## Applied Adjustments
 - **AM Send Time**: {macro_info.get('am_send_delay', 'Normal (7:00 ET)')}
 - **Band Widening**: +{macro_info.get('band_adjustment', 0):.0f}%
 - **Gate Active**: {macro_info['gate_active']}
-
----
-Generated by Macro Gate System
 """
         
-        report_file = audit_dir / 'MACRO_GATE.md'
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
-        
-        return str(report_file)
+        return [_MACRO_REPORT_HEAD, header.encode('utf-8'), _MACRO_REPORT_RULES,
+                body.encode('utf-8'), _MACRO_REPORT_FOOT]
     
     def write_news_score_report(self, result, output_dir):
         """Write NEWS_SCORE.md artifact"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        audit_dir = Path(output_dir) / 'daily' / timestamp
-        audit_dir.mkdir(parents=True, exist_ok=True)
+        audit_dir = _ensure_dir(Path(output_dir) / 'daily' / result['_ts_compact'])
+        
+        report_file = audit_dir / 'NEWS_SCORE.md'
+        _write_report_bytes(report_file, self._render_news_score_report(result))
         
+        return str(report_file)
+    
+    def _render_news_score_report(self, result):
+        """Render NEWS_SCORE.md as a list of UTF-8 chunks"""
         news_analysis = result['news_analysis']
         news_info = news_analysis['info']
         adjustments = news_analysis['adjustments']
         
-        report = f"""# News Score Report
-
-**Timestamp**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+        header = f"""**Timestamp**: {result['_ts_pretty']}
 **Analysis Period**: {news_info['lookback_hours']}h lookback
 **Enabled**: {self.news_enabled}
 
@@ -608,55 +750,47 @@ Generated by Macro Gate System
 **Event Count**: {news_info['count']} articles/events
 **Score Range**: [{news_info.get('score_range', [0, 0])[0]:.2f}, {news_info.get('score_range', [0, 0])[1]:.2f}]
 
-## Score Interpretation
-- **< -0.3**: Risk-off sentiment (bearish)
-- **-0.3 to 0.3**: Neutral sentiment  
-- **> 0.3**: Risk-on sentiment (bullish)
-- **Current**: {"Risk-off" if news_analysis['score'] <= -0.3 else "Risk-on" if news_analysis['score'] >= 0.3 else "Neutral"}
+"""
+        
+        # Same thresholds as the adjustment itself (NEWS_RISK_*_THRESHOLD)
+        current = {'risk-off': 'Risk-off', 'risk-on': 'Risk-on'}.get(_classify_news(news_analysis['score'])[2], 'Neutral')
+        
+        body = f"""- **Current**: {current}
 
 ## Applied Adjustments
 - **Band Adjustment**: {adjustments['band_adjustment']:+.1f}%
 - **Confidence Adjustment**: {adjustments['confidence_adjustment']:+.1f}%
 - **Trigger Used**: {adjustments['active_rule'] or 'None (score within neutral range)'}
 
-## Adjustment Rules
-- **Risk-off** (score ≤ -0.3): Widen bands +10%, reduce confidence -5%
-- **Risk-on** (score ≥ 0.3): Tighten bands -5%, boost confidence +5%  
-- **Neutral** (-0.3 < score < 0.3): No adjustments
-
----
-Generated by News Scoring System
 """
         
-        report_file = audit_dir / 'NEWS_SCORE.md'
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
-        
-        return str(report_file)
+        return [_NEWS_REPORT_HEAD, header.encode('utf-8'), _NEWS_REPORT_SCALE,
+                body.encode('utf-8'), _NEWS_REPORT_RULES, _NEWS_REPORT_FOOT]
 
 
 def main():
-    """Test run of Macro & News Gates"""
+    """Run Macro & News Gates implementation"""
     gates = MacroNewsGates()
+    result = gates.mr5_macro_news_gates()
     
-    # Test with today's date
-    target_date = datetime.now().date()
-    target_time = datetime.now()
-    
-    result = gates.process_gates(target_date, target_time)
+    print("MR 5: Macro & News Gates Implementation")
+    print(f"  Macro Gate: {'ACTIVE' if result['macro_gate']['macro_gate_active'] else 'INACTIVE'}")
+    print(f"  AM Send Time: {result['macro_gate']['am_send_time']} ET")
+    print(f"  News Score: {result['news_score']['weighted_score']:+.2f} ({result['news_score']['adjustment_type']})")
+    print(f"  News Adjustment: Widen {result['news_score']['widen_adjustment']:+.0%}, Confidence {result['news_score']['confidence_adjustment']:+.0%}")
     
-    # Write reports
-    output_dir = 'audit_exports'
-    macro_report = gates.write_macro_gate_report(result, output_dir) 
-    news_report = gates.write_news_score_report(result, output_dir)
+    # Gate pipeline run for today; its reports share the MR 5 file names, so they get their own tree
+    now = datetime.now()
+    gates_result = gates.process_gates(now.date(), now)
+    gates.write_gate_reports(gates_result, 'audit_exports/gates')
     
-    print(f"Macro gate active: {result['macro_gate']['gate_active']}")
-    print(f"News score: {result['news_analysis']['score']:.3f}")
-    print(f"Total band adjustment: {result['combined_adjustments']['total_band_adjustment']:+.1f}%")
-    print(f"Active rules: {len(result['combined_adjustments']['active_rules'])}")
+    print(f"  Macro gate active: {gates_result['macro_gate']['gate_active']}")
+    print(f"  News score: {gates_result['news_analysis']['score']:.3f}")
+    print(f"  Total band adjustment: {gates_result['combined_adjustments']['total_band_adjustment']:+.1f}%")
+    print(f"  Active rules: {len(gates_result['combined_adjustments']['active_rules'])}")
     
     return result
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -4,12 +4,15 @@ Macro & News Gates Implementation
 Calendar/news-driven adjustments with gentle widening/tightening
 """
 
-import os
 import csv
-from datetime import datetime, timedelta
+from collections import namedtuple
+from datetime import datetime
 from pathlib import Path
 
 
+NewsEvent = namedtuple('NewsEvent', ['timestamp', 'headline', 'score'])
+
+
 class MacroNewsGates:
     """Macro and News gates system"""
     
@@ -82,10 +85,11 @@ class MacroNewsGates:
         ]
         
         csv_file = self.audit_dir / 'macro_schedule.csv'
+        fieldnames = ('date', 'time', 'event', 'severity')
         with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['date', 'time', 'event', 'severity'])
-            writer.writeheader()
-            writer.writerows(macro_events)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(tuple(e[k] for k in fieldnames) for e in macro_events)
         
         return str(csv_file)
     
@@ -122,13 +126,25 @@ class MacroNewsGates:
         ]
         
         csv_file = self.audit_dir / 'news_events.csv'  
+        fieldnames = ('timestamp', 'headline', 'score')
         with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['timestamp', 'headline', 'score'])
-            writer.writeheader()
-            writer.writerows(news_events)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(tuple(e[k] for k in fieldnames) for e in news_events)
         
         return str(csv_file)
     
+    def load_news_events(self):
+        """Read news_events.csv row-wise with the stdlib csv reader"""
+        csv_file = self.audit_dir / 'news_events.csv'
+        if not csv_file.exists():
+            return []
+        
+        with open(csv_file, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # header
+            return [NewsEvent(timestamp, headline, float(score)) for timestamp, headline, score in reader]
+    
     def process_macro_gate(self):
         """Process macro gate logic"""
         
@@ -159,8 +175,8 @@ class MacroNewsGates:
     def process_news_score(self):
         """Process news score adjustments"""
         
-        # Simulate aggregate news score calculation
-        recent_scores = [0.1, 0.4, 0.2, -0.2, -0.3]  # From news_events.csv
+        # Aggregate news score from news_events.csv (sample scores if not yet written)
+        recent_scores = [event.score for event in self.load_news_events()] or [0.1, 0.4, 0.2, -0.2, -0.3]
         
         # Weighted average (more recent = higher weight)
         weights = [0.3, 0.25, 0.2, 0.15, 0.1]
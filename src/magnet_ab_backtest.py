@@ -7,8 +7,9 @@ Baseline+Impact vs Baseline+Impact+Magnet (60-day backtest)
 import os
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
+from string import Template
 import sys
 
 # Add src to path
@@ -17,101 +18,195 @@ sys.path.append(str(Path(__file__).parent))
 from zen_council import ZenCouncil
 from event_impact_engine import EventImpactEngine
 from level_magnet_engine import LevelMagnetEngine
+from magnet_guardrails import AuditContext, calculate_ece
+
+# NumPy >= 2.0 has a native popcount ufunc; older versions unpack the bits instead
+BITWISE_COUNT_AVAILABLE = hasattr(np, 'bitwise_count')
+
+
+def popcount(packed):
+    """Number of set bits in a np.packbits array"""
+    if BITWISE_COUNT_AVAILABLE:
+        return int(np.bitwise_count(packed).sum())
+    return int(np.unpackbits(packed).sum())
 
 
 class MagnetABBacktest:
     """A/B backtest: Baseline+Impact vs Baseline+Impact+Magnet"""
     
+    # Report layout is parsed once per process; values are pre-formatted in write_magnet_ab_reports
+    _REPORT_TMPL = Template("""# Magnet Engine A/B Backtest Report
+
+**Timestamp**: ${timestamp}
+**Backtest Period**: ${backtest_days} trading days
+**Mode**: SHADOW (Magnet adjustments logged, not applied live)
+
+## Executive Summary
+
+### Verdict: ${verdict}
+
+### Performance Metrics
+- **Brier Score Improvement**: ${brier_improvement}%
+- **ECE Improvement (20d)**: ${ece_improvement}%
+- **Straddle Gap Change**: ${straddle_improvement}
+- **Edge Hits Improvement**: ${edge_hits_improvement}
+
+## Backtest Analysis
+
+### Test Design
+- **Control Arm**: Baseline + Impact (no magnet)
+- **Treatment Arm**: Baseline + Impact + Magnet
+- **Days Tested**: ${backtest_days} trading days
+- **Magnet Active Days**: ${magnet_active_days} (${magnet_active_pct}%)
+- **OPEX Days**: ${opex_days} (${opex_pct}%)
+
+### Magnet Impact Summary
+- **Average Center Shift**: ${avg_center_shift} points
+- **Average Width Change**: ${avg_width_delta}%
+- **Strong Magnet Days (M>0.5)**: ${strong_magnet_days}
+
+## Performance Assessment
+
+### Control Arm (Baseline + Impact)
+- **Brier Score**: ${control_brier}
+- **Hit Rate**: ${control_hit_rate}%
+- **ECE**: ${control_ece}
+
+### Treatment Arm (Baseline + Impact + Magnet)
+- **Brier Score**: ${treatment_brier}
+- **Hit Rate**: ${treatment_hit_rate}%
+- **ECE**: ${treatment_ece}
+
+
+## Verdict Analysis
+
+${verdict_block}
+## Risk Assessment
+
+### Magnet Engine Safety
+- **Direction Changes**: None (shadow mode only)
+- **Probability Impact**: Minimal (bands/center only)
+- **Max Center Shift**: ±${max_center_shift}% ATR
+- **Max Width Tighten**: ${max_width_tighten}%
+
+### Shadow Mode Compliance
+- **Live Changes**: None applied
+- **Production Impact**: Zero
+- **Testing Status**: Safe for continued evaluation
+
+## Technical Details
+
+### Magnet Parameters Used
+- **Decay Constant (τ)**: ${tau}
+- **Center Nudge (γ)**: ${gamma}
+- **Width Tighten (β)**: ${beta}
+- **OPEX Multiplier (κ)**: ${opex_multiplier}
+
+### Data Sources
+- **SPX Reference**: ES futures / SPX close
+- **ATR Calculation**: 14-day rolling
+- **OPEX Calendar**: Weekly (M/W/F) + Monthly (3rd Fri)
+
+---
+Generated by Magnet A/B Backtest System v0.1
+**SHADOW MODE**: No live trading impact
+""")
+    
+    _VERDICT_BLOCKS = {
+        'WIN': (
+            "✅ **MAGNET HELPS**: Brier score improved without significant ECE degradation\n"
+            "- **Recommendation**: Continue shadow testing, consider activation\n"
+        ),
+        'LOSE': (
+            "❌ **MAGNET HURTS**: Significant performance degradation detected\n"
+            "- **Recommendation**: Review parameters or disable magnet\n"
+        ),
+        'TIE': (
+            "⚪ **NEUTRAL**: No significant improvement or degradation\n"
+            "- **Recommendation**: Extended testing period needed\n"
+        )
+    }
+    
     def __init__(self):
         self.council = ZenCouncil()
         self.impact_engine = EventImpactEngine()
         self.magnet_engine = LevelMagnetEngine()
         self.lookback_days = 60
+        self.seed = 42  # Reproducible synthetic outcomes
+        
+        # Sample Impact band (same for every simulated day)
+        self.band_center = 5600
+        self.band_width_pct = 2.5
+        
+        # Populated by run_magnet_ab_backtest for report writing
+        self.last_backtest_df = None
+        self.last_performance = None
         
     def simulate_baseline_impact_magnet(self, target_date, p_baseline):
         """Simulate Baseline + Impact + Magnet forecast"""
-        try:
-            # Step 1: Get Council baseline adjustment (same for both arms)
-            council_result = self.council.adjust_forecast(p_baseline)
-            p_council = council_result.get('p_final', p_baseline)
-            
-            # Step 2: Apply Impact adjustments (same for both arms)
-            # Simulate Impact Engine (simplified)
-            band_center = 5600  # Sample center
-            band_width_pct = 2.5  # Sample width
-            
-            # Step 3A: Control arm - no magnet
-            control_center = band_center
-            control_width = band_width_pct
-            
-            # Step 3B: Treatment arm - apply magnet
-            magnet_result = self.magnet_engine.run_magnet_analysis(
-                band_center, band_width_pct, target_date
-            )
-            
-            treatment_center = magnet_result['center_after']
-            treatment_width_pct = magnet_result['width_after']
-            
-            # For backtest purposes, adjust probabilities slightly based on band changes
-            # This is a simplified simulation - in reality would affect actual trading
-            center_shift = magnet_result['center_shift']
-            width_change = magnet_result['width_delta_pct']
-            
-            # Slight probability adjustment (very conservative for shadow mode)
-            magnet_prob_adjustment = 0.0  # Keep probabilities same for shadow safety
-            
-            return {
-                'date': target_date,
-                'p_baseline': p_baseline,
-                'p_council': p_council,
-                'control': {
-                    'p_final': p_council,
-                    'center': control_center,
-                    'width_pct': control_width
-                },
-                'treatment': {
-                    'p_final': p_council + magnet_prob_adjustment,
-                    'center': treatment_center,
-                    'width_pct': treatment_width_pct,
-                    'center_shift': center_shift,
-                    'width_delta_pct': width_change
-                },
-                'magnet_data': magnet_result
-            }
-            
-        except Exception as e:
-            print(f"Error simulating {target_date}: {e}")
-            return None
+        # Step 1: Get Council baseline adjustment (same for both arms)
+        council_result = self.council.adjust_forecast(p_baseline)
+        p_council = council_result.get('p_final', p_baseline)
+        
+        # Step 2: Apply Impact adjustments (same for both arms)
+        # Simulate Impact Engine (simplified)
+        band_center = self.band_center
+        band_width_pct = self.band_width_pct
+        
+        # Step 3A: Control arm - no magnet
+        control_center = band_center
+        control_width = band_width_pct
+        
+        # Step 3B: Treatment arm - apply magnet
+        magnet_result = self.magnet_engine.run_magnet_analysis(
+            band_center, band_width_pct, target_date
+        )
+        
+        treatment_center = magnet_result['center_after']
+        treatment_width_pct = magnet_result['width_after']
+        
+        # For backtest purposes, adjust probabilities slightly based on band changes
+        # This is a simplified simulation - in reality would affect actual trading
+        center_shift = magnet_result['center_shift']
+        width_change = magnet_result['width_delta_pct']
+        
+        # Slight probability adjustment (very conservative for shadow mode)
+        magnet_prob_adjustment = 0.0  # Keep probabilities same for shadow safety
+        
+        return {
+            'date': target_date,
+            'p_baseline': p_baseline,
+            'p_council': p_council,
+            'control': {
+                'p_final': p_council,
+                'center': control_center,
+                'width_pct': control_width
+            },
+            'treatment': {
+                'p_final': p_council + magnet_prob_adjustment,
+                'center': treatment_center,
+                'width_pct': treatment_width_pct,
+                'center_shift': center_shift,
+                'width_delta_pct': width_change
+            },
+            'magnet_data': magnet_result
+        }
     
     def generate_synthetic_outcomes(self, backtest_days=60):
         """Generate synthetic market outcomes for backtesting"""
         # Generate realistic SPX daily returns
-        np.random.seed(42)  # Reproducible
-        
-        dates = []
-        outcomes = []
-        baselines = []
-        
-        start_date = datetime.now().date() - timedelta(days=backtest_days + 10)
-        
-        for i in range(backtest_days):
-            date = start_date + timedelta(days=i)
-            
-            # Skip weekends
-            if date.weekday() >= 5:
-                continue
-            
-            # Generate synthetic baseline probability (0.45-0.65 range)
-            baseline = 0.50 + np.random.normal(0, 0.05)
-            baseline = max(0.35, min(0.65, baseline))  # Clip
-            
-            # Generate outcome (1=up, 0=down) with some correlation to baseline
-            outcome_prob = baseline + np.random.normal(0, 0.15)
-            outcome = 1 if np.random.random() < outcome_prob else 0
-            
-            dates.append(date)
-            baselines.append(baseline)
-            outcomes.append(outcome)
+        rng = np.random.Generator(np.random.PCG64DXSM(self.seed))  # Reproducible per call
+        
+        # Business days only, ending 10 days back
+        end_date = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=10)
+        dates = pd.bdate_range(end=end_date, periods=backtest_days).date
+        
+        # Generate synthetic baseline probability (0.45-0.65 range)
+        baselines = np.clip(0.50 + 0.05 * rng.standard_normal(backtest_days), 0.35, 0.65)
+        
+        # Generate outcome (1=up, 0=down) with some correlation to baseline
+        outcome_prob = baselines + 0.15 * rng.standard_normal(backtest_days)
+        outcomes = (rng.random(backtest_days) < outcome_prob).astype(int)
         
         return pd.DataFrame({
             'date': dates,
@@ -119,50 +214,39 @@ class MagnetABBacktest:
             'actual_outcome': outcomes
         })
     
+    def calculate_arm_metrics(self, probs, outcomes, outcomes_up):
+        """Brier, ECE, straddle gap, edge hits and hit rate for one arm"""
+        n = len(probs)
+        
+        # Shared intermediates: one residual and one distance-from-0.5 array
+        residual = probs - outcomes
+        centered = probs - 0.5
+        distance = np.abs(centered)
+        
+        # Bit-packed masks: 8 days per byte, counts are a popcount (pad bits are 0)
+        correct_bits = np.packbits((centered > 0) == outcomes_up)
+        edge_bits = np.packbits(distance > 0.2)  # p < 0.3 or p > 0.7
+        
+        # Expected Calibration Error (simplified 20-day, 5 bins)
+        ece = calculate_ece(probs[-20:], outcomes[-20:], n_bins=5)
+        
+        return {
+            'brier_score': np.dot(residual, residual) / n,
+            'ece': ece,
+            'straddle_gap': distance.mean(),  # Simplified - distance from 0.5
+            'edge_hits': popcount(edge_bits & correct_bits),
+            'hit_rate': popcount(correct_bits) / n
+        }
+    
     def calculate_performance_metrics(self, results_df):
         """Calculate Brier, ECE, Straddle, Edge Hits metrics"""
-        metrics = {}
-        
-        for arm in ['control', 'treatment']:
-            probs = results_df[f'{arm}_prob'].values
-            outcomes = results_df['actual_outcome'].values
-            
-            # Brier Score
-            brier = np.mean((probs - outcomes) ** 2)
-            
-            # Expected Calibration Error (simplified 20-day)
-            recent_probs = probs[-20:] if len(probs) >= 20 else probs
-            recent_outcomes = outcomes[-20:] if len(outcomes) >= 20 else outcomes
-            
-            # Bin into 5 bins for ECE
-            bin_boundaries = np.linspace(0, 1, 6)
-            ece = 0.0
-            
-            for i in range(5):
-                bin_lower, bin_upper = bin_boundaries[i], bin_boundaries[i + 1]
-                in_bin = (recent_probs > bin_lower) & (recent_probs <= bin_upper)
-                
-                if np.sum(in_bin) > 0:
-                    bin_accuracy = np.mean(recent_outcomes[in_bin])
-                    bin_confidence = np.mean(recent_probs[in_bin])
-                    bin_weight = np.sum(in_bin) / len(recent_probs)
-                    ece += bin_weight * abs(bin_accuracy - bin_confidence)
-            
-            # Straddle Gap (simplified - distance from 0.5)
-            straddle_gap = np.mean(np.abs(probs - 0.5))
-            
-            # Edge Hits (extreme outcomes captured)
-            edge_probs = (probs < 0.3) | (probs > 0.7)
-            edge_outcomes_correct = np.sum(edge_probs & ((probs > 0.5) == outcomes.astype(bool)))
-            edge_hits = int(edge_outcomes_correct)
-            
-            metrics[arm] = {
-                'brier_score': brier,
-                'ece': ece,
-                'straddle_gap': straddle_gap,
-                'edge_hits': edge_hits,
-                'hit_rate': np.mean((probs > 0.5) == outcomes.astype(bool))
-            }
+        outcomes = results_df['actual_outcome'].values.astype(float)
+        outcomes_up = outcomes > 0
+        
+        metrics = {
+            arm: self.calculate_arm_metrics(results_df[f'{arm}_prob'].values, outcomes, outcomes_up)
+            for arm in ['control', 'treatment']
+        }
         
         # Calculate improvements
         brier_improvement_pct = (metrics['control']['brier_score'] - metrics['treatment']['brier_score']) / metrics['control']['brier_score'] * 100
@@ -197,30 +281,34 @@ class MagnetABBacktest:
         # Generate synthetic data
         backtest_df = self.generate_synthetic_outcomes(days)
         
-        results = []
-        
-        for _, row in backtest_df.iterrows():
-            date = row['date']
-            p_baseline = row['p_baseline']
-            actual_outcome = row['actual_outcome']
-            
-            # Simulate both arms
-            sim_result = self.simulate_baseline_impact_magnet(date, p_baseline)
-            
-            if sim_result:
-                results.append({
-                    'date': date,
-                    'p_baseline': p_baseline,
-                    'control_prob': sim_result['control']['p_final'],
-                    'treatment_prob': sim_result['treatment']['p_final'],
-                    'actual_outcome': actual_outcome,
-                    'magnet_strength': sim_result['magnet_data']['strength'],
-                    'center_shift': sim_result['treatment']['center_shift'],
-                    'width_delta': sim_result['treatment']['width_delta_pct'],
-                    'is_opex': sim_result['magnet_data']['is_opex']
-                })
-        
-        results_df = pd.DataFrame(results)
+        p_baselines = backtest_df['p_baseline'].values
+        
+        # Validate the whole series up front; a bad input aborts the run instead of dropping rows
+        if not ((p_baselines >= 0) & (p_baselines <= 1)).all():  # NaN fails both comparisons
+            raise ValueError("Backtest p_baseline values must be probabilities in [0, 1]")
+        if backtest_df['date'].isna().any():
+            raise ValueError("Backtest dates contain missing values")
+        
+        # Council baseline adjustment (same for both arms)
+        p_council = self.council.adjust_forecasts(p_baselines)
+        
+        # Treatment arm magnet adjustments for every date in one batch
+        magnet = self.magnet_engine.run_magnet_analysis_batch(
+            self.band_center, self.band_width_pct, backtest_df['date'].values
+        )
+        
+        # Probabilities kept the same in the treatment arm for shadow safety
+        results_df = pd.DataFrame({
+            'date': backtest_df['date'].values,
+            'p_baseline': p_baselines,
+            'control_prob': p_council,
+            'treatment_prob': p_council + 0.0,
+            'actual_outcome': backtest_df['actual_outcome'].values,
+            'magnet_strength': magnet['strength'],
+            'center_shift': magnet['center_shift'],
+            'width_delta': magnet['width_delta_pct'],
+            'is_opex': magnet['is_opex']
+        })
         
         if len(results_df) == 0:
             return {
@@ -236,134 +324,79 @@ class MagnetABBacktest:
         self.last_backtest_df = results_df
         self.last_performance = performance
         
+        magnet_strength = results_df['magnet_strength'].values
+        control = performance['control_metrics']
+        treatment = performance['treatment_metrics']
+        
         return {
             'verdict': performance['verdict'],
             'metrics': performance['improvements'],
             'backtest_days': len(results_df),
-            'magnet_active_days': np.sum(results_df['magnet_strength'] > 0.1),
+            'magnet_active_days': np.sum(magnet_strength > 0.1),
             'opex_days': np.sum(results_df['is_opex']),
             'avg_center_shift': np.mean(np.abs(results_df['center_shift'])),
-            'avg_width_delta': np.mean(results_df['width_delta'])
+            'avg_width_delta': np.mean(results_df['width_delta']),
+            'report_metrics': {
+                'strong_magnet_days': int(np.sum(magnet_strength > 0.5)),
+                'control_brier': control['brier_score'],
+                'control_hit_rate': control['hit_rate'],
+                'control_ece': control['ece'],
+                'treatment_brier': treatment['brier_score'],
+                'treatment_hit_rate': treatment['hit_rate'],
+                'treatment_ece': treatment['ece']
+            }
         }
     
-    def write_magnet_ab_reports(self, ab_result, output_dir='audit_exports'):
-        """Write MAGNET_AB_REPORT.md and CSV"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        audit_dir = Path(output_dir) / 'daily' / timestamp
-        audit_dir.mkdir(parents=True, exist_ok=True)
+    def write_magnet_ab_reports(self, ab_result, output_dir='audit_exports', ctx=None):
+        """Write MAGNET_AB_REPORT.md and CSV (into ctx.dir when an AuditContext is shared)"""
+        if ctx is None:
+            ctx = AuditContext(output_dir)
         
         # Write markdown report
-        report_file = audit_dir / 'MAGNET_AB_REPORT.md'
-        csv_file = audit_dir / 'MAGNET_AB_REPORT.csv'
-        
-        # Markdown report
-        content = f"""# Magnet Engine A/B Backtest Report
-
-**Timestamp**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-**Backtest Period**: {ab_result['backtest_days']} trading days
-**Mode**: SHADOW (Magnet adjustments logged, not applied live)
-
-## Executive Summary
-
-### Verdict: {ab_result['verdict']}
-
-### Performance Metrics
-- **Brier Score Improvement**: {ab_result['metrics']['brier_improvement_pct']:+.2f}%
-- **ECE Improvement (20d)**: {ab_result['metrics']['ece_improvement_pct']:+.1f}%
-- **Straddle Gap Change**: {ab_result['metrics']['straddle_improvement']:+.3f}
-- **Edge Hits Improvement**: {ab_result['metrics']['edge_hits_improvement']:+d}
-
-## Backtest Analysis
-
-### Test Design
-- **Control Arm**: Baseline + Impact (no magnet)
-- **Treatment Arm**: Baseline + Impact + Magnet
-- **Days Tested**: {ab_result['backtest_days']} trading days
-- **Magnet Active Days**: {ab_result['magnet_active_days']} ({ab_result['magnet_active_days']/ab_result['backtest_days']*100:.1f}%)
-- **OPEX Days**: {ab_result['opex_days']} ({ab_result['opex_days']/ab_result['backtest_days']*100:.1f}%)
-
-### Magnet Impact Summary
-- **Average Center Shift**: {ab_result['avg_center_shift']:.2f} points
-- **Average Width Change**: {ab_result['avg_width_delta']:+.1f}%
-- **Strong Magnet Days (M>0.5)**: {np.sum(self.last_backtest_df['magnet_strength'] > 0.5) if hasattr(self, 'last_backtest_df') else 'N/A'}
-
-## Performance Assessment
-
-### Control Arm (Baseline + Impact)
-"""
-        
-        if hasattr(self, 'last_performance'):
-            content += f"- **Brier Score**: {self.last_performance['control_metrics']['brier_score']:.4f}\n"
-            content += f"- **Hit Rate**: {self.last_performance['control_metrics']['hit_rate']*100:.1f}%\n"
-            content += f"- **ECE**: {self.last_performance['control_metrics']['ece']:.4f}\n"
-        else:
-            content += "- **Brier Score**: N/A\n- **Hit Rate**: N/A\n- **ECE**: N/A\n"
-        
-        content += """
-### Treatment Arm (Baseline + Impact + Magnet)
-"""
-        
-        if hasattr(self, 'last_performance'):
-            content += f"- **Brier Score**: {self.last_performance['treatment_metrics']['brier_score']:.4f}\n"
-            content += f"- **Hit Rate**: {self.last_performance['treatment_metrics']['hit_rate']*100:.1f}%\n"
-            content += f"- **ECE**: {self.last_performance['treatment_metrics']['ece']:.4f}\n"
-        else:
-            content += "- **Brier Score**: N/A\n- **Hit Rate**: N/A\n- **ECE**: N/A\n"
+        report_file = ctx.dir / 'MAGNET_AB_REPORT.md'
+        csv_file = ctx.dir / 'MAGNET_AB_REPORT.csv'
         
-        content += """
-
-## Verdict Analysis
-
-"""
+        report_metrics = ab_result['report_metrics']
         
-        if ab_result['verdict'] == 'WIN':
-            content += "✅ **MAGNET HELPS**: Brier score improved without significant ECE degradation\n"
-            content += "- **Recommendation**: Continue shadow testing, consider activation\n"
-        elif ab_result['verdict'] == 'LOSE':
-            content += "❌ **MAGNET HURTS**: Significant performance degradation detected\n"
-            content += "- **Recommendation**: Review parameters or disable magnet\n"
-        else:
-            content += "⚪ **NEUTRAL**: No significant improvement or degradation\n"
-            content += "- **Recommendation**: Extended testing period needed\n"
-        
-        content += f"""
-## Risk Assessment
-
-### Magnet Engine Safety
-- **Direction Changes**: None (shadow mode only)
-- **Probability Impact**: Minimal (bands/center only)
-- **Max Center Shift**: ±{self.magnet_engine.max_center_shift_atr*100:.0f}% ATR
-- **Max Width Tighten**: {self.magnet_engine.max_width_tighten_pct*100:.0f}%
-
-### Shadow Mode Compliance
-- **Live Changes**: None applied
-- **Production Impact**: Zero
-- **Testing Status**: Safe for continued evaluation
-
-## Technical Details
-
-### Magnet Parameters Used
-- **Decay Constant (τ)**: {self.magnet_engine.tau}
-- **Center Nudge (γ)**: {self.magnet_engine.gamma}
-- **Width Tighten (β)**: {self.magnet_engine.beta}
-- **OPEX Multiplier (κ)**: {self.magnet_engine.opex_multiplier}
-
-### Data Sources
-- **SPX Reference**: ES futures / SPX close
-- **ATR Calculation**: 14-day rolling
-- **OPEX Calendar**: Weekly (M/W/F) + Monthly (3rd Fri)
-
----
-Generated by Magnet A/B Backtest System v0.1
-**SHADOW MODE**: No live trading impact
-"""
+        # Markdown report
+        metrics = ab_result['metrics']
+        days = ab_result['backtest_days']
+        engine = self.magnet_engine
+        content = self._REPORT_TMPL.substitute(
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+            backtest_days=days,
+            verdict=ab_result['verdict'],
+            brier_improvement=f"{metrics['brier_improvement_pct']:+.2f}",
+            ece_improvement=f"{metrics['ece_improvement_pct']:+.1f}",
+            straddle_improvement=f"{metrics['straddle_improvement']:+.3f}",
+            edge_hits_improvement=f"{metrics['edge_hits_improvement']:+d}",
+            magnet_active_days=ab_result['magnet_active_days'],
+            magnet_active_pct=f"{ab_result['magnet_active_days']/days*100:.1f}",
+            opex_days=ab_result['opex_days'],
+            opex_pct=f"{ab_result['opex_days']/days*100:.1f}",
+            avg_center_shift=f"{ab_result['avg_center_shift']:.2f}",
+            avg_width_delta=f"{ab_result['avg_width_delta']:+.1f}",
+            strong_magnet_days=report_metrics['strong_magnet_days'],
+            control_brier=f"{report_metrics['control_brier']:.4f}",
+            control_hit_rate=f"{report_metrics['control_hit_rate']*100:.1f}",
+            control_ece=f"{report_metrics['control_ece']:.4f}",
+            treatment_brier=f"{report_metrics['treatment_brier']:.4f}",
+            treatment_hit_rate=f"{report_metrics['treatment_hit_rate']*100:.1f}",
+            treatment_ece=f"{report_metrics['treatment_ece']:.4f}",
+            verdict_block=self._VERDICT_BLOCKS.get(ab_result['verdict'], self._VERDICT_BLOCKS['TIE']),
+            max_center_shift=f"{engine.max_center_shift_atr*100:.0f}",
+            max_width_tighten=f"{engine.max_width_tighten_pct*100:.0f}",
+            tau=engine.tau,
+            gamma=engine.gamma,
+            beta=engine.beta,
+            opex_multiplier=engine.opex_multiplier
+        )
         
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write(content)
         
         # Write CSV file
-        if hasattr(self, 'last_backtest_df'):
+        if self.last_backtest_df is not None:
             self.last_backtest_df.to_csv(csv_file, index=False)
         
         return str(report_file), str(csv_file)
@@ -376,8 +409,9 @@ def main():
     # Run backtest
     result = backtest.run_magnet_ab_backtest(days=60)
     
-    # Write reports
-    report_md, report_csv = backtest.write_magnet_ab_reports(result)
+    # Write reports (one audit directory, created once, for every writer in this run)
+    ctx = AuditContext()
+    report_md, report_csv = backtest.write_magnet_ab_reports(result, ctx=ctx)
     
     print(f"Magnet A/B backtest complete!")
     print(f"Verdict: {result['verdict']}")
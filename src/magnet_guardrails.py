@@ -5,69 +5,169 @@ Auto-mute system for Level Magnet Engine based on performance degradation
 """
 
 import os
+import weakref
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
-import csv
+
+try:
+    import pyarrow  # enables pandas' multithreaded CSV engine
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+def calculate_ece(probs, outcomes, n_bins=5):
+    """Expected Calibration Error over equal-width (lower, upper] probability bins"""
+    probs = np.asarray(probs, dtype=float)
+    outcomes = np.asarray(outcomes, dtype=float)
+    if probs.size == 0:
+        return 0.0
+    
+    bin_idx = np.digitize(probs, np.linspace(0, 1, n_bins + 1), right=True) - 1
+    in_range = (bin_idx >= 0) & (bin_idx < n_bins)
+    bin_idx = bin_idx[in_range]
+    
+    # Per-bin sums in one pass; weight * |acc - conf| == |sum(y) - sum(p)| / N
+    counts = np.bincount(bin_idx, minlength=n_bins)
+    prob_sums = np.bincount(bin_idx, weights=probs[in_range], minlength=n_bins)
+    outcome_sums = np.bincount(bin_idx, weights=outcomes[in_range], minlength=n_bins)
+    occupied = counts > 0
+    
+    return float(np.abs(outcome_sums[occupied] - prob_sums[occupied]).sum() / probs.size)
+
+
+class AuditContext:
+    """Audit export directory created once and shared by report writers run in sequence"""
+    
+    def __init__(self, output_dir='audit_exports', subdir='daily', timestamp=None):
+        self.timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.dir = Path(output_dir) / subdir / self.timestamp
+        self.dir.mkdir(parents=True, exist_ok=True)
 
 
 class MagnetGuardrails:
     """Auto-mute guardrail system for Magnet Engine"""
     
+    LOG_COLUMNS = ['date', 'p_baseline', 'p_with_magnet', 'actual_outcome',
+                   'baseline_brier', 'magnet_brier', 'magnet_active', 'muted']
+    ENTRY_COLUMNS = ['date', 'p_baseline', 'p_with_magnet', 'actual_outcome', 'magnet_active', 'muted']
+    
     def __init__(self):
         self.brier_threshold_pct = 2.0  # 2% Brier degradation triggers mute
         self.ece_threshold_pct = 1.0   # 1% ECE degradation limit
         self.shadow_period_days = 10   # Rolling window for assessment
         self.decision_log_path = 'audit_exports/MAGNET_DECISION_LOG.csv'
         
-    def log_magnet_performance(self, date, p_baseline, p_with_magnet, actual_outcome, magnet_active=True):
-        """Log daily magnet performance for guardrail assessment"""
+        # Read once per run rather than per logged row
+        self._muted = os.getenv('MAGNET_MUTED', 'false').lower() == 'true'
+        
+        # Pending decision log rows, appended to the CSV in one write by flush();
+        # the finalizer writes leftovers when the instance is collected or at exit without keeping it alive
+        self._buffer = []
+        self._finalizer = weakref.finalize(self, self._write_rows, self.decision_log_path, self._buffer)
+        
+        # Parsed decision log, reused until the file's mtime changes
+        self._log_cache = None
+        
+    def flush(self):
+        """Append buffered decision log rows to MAGNET_DECISION_LOG.csv"""
+        self._write_rows(self.decision_log_path, self._buffer)
+    
+    def close(self):
+        """Flush pending rows now and detach the exit-time finalizer"""
+        self.flush()
+        self._finalizer.detach()
+    
+    @classmethod
+    def _write_rows(cls, log_path, rows):
+        """Append buffered row tuples to the decision log and empty the buffer in place"""
+        if not rows:
+            return
         
-        # Ensure log directory exists
-        Path(self.decision_log_path).parent.mkdir(parents=True, exist_ok=True)
+        entries = pd.DataFrame(rows, columns=cls.ENTRY_COLUMNS)
+        rows.clear()
+        cls._append_entries(log_path, entries)
+    
+    @classmethod
+    def _append_entries(cls, log_path, entries):
+        """Add Brier columns and append entries to the decision log in one to_csv call"""
+        log_path = Path(log_path)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Calculate Brier scores
-        baseline_brier = (p_baseline - actual_outcome) ** 2
-        magnet_brier = (p_with_magnet - actual_outcome) ** 2
+        # Header only for a new or empty file, checked at write time (other instances/processes share the log)
+        write_header = not log_path.exists() or log_path.stat().st_size == 0
         
-        # Log entry
+        cls.add_brier_columns(entries)
+        entries[cls.LOG_COLUMNS].to_csv(
+            log_path, mode='a', header=write_header, index=False, lineterminator='\r\n'
+        )
+    
+    @staticmethod
+    def add_brier_columns(df):
+        """Compute baseline/magnet Brier scores column-wise"""
+        outcomes = df['actual_outcome'].to_numpy(dtype=float)
+        df['baseline_brier'] = (df['p_baseline'].to_numpy(dtype=float) - outcomes) ** 2
+        df['magnet_brier'] = (df['p_with_magnet'].to_numpy(dtype=float) - outcomes) ** 2
+        return df
+    
+    def log_magnet_performance(self, date, p_baseline, p_with_magnet, actual_outcome, magnet_active=True):
+        """Log daily magnet performance for guardrail assessment"""
+        
+        # Log entry (Brier scores are computed per batch in flush())
         log_entry = {
             'date': date.strftime('%Y-%m-%d'),
             'p_baseline': p_baseline,
             'p_with_magnet': p_with_magnet,
             'actual_outcome': actual_outcome,
-            'baseline_brier': baseline_brier,
-            'magnet_brier': magnet_brier,
             'magnet_active': magnet_active,
-            'muted': os.getenv('MAGNET_MUTED', 'false').lower() == 'true'
+            'muted': self._muted
         }
         
-        # Write to CSV
-        file_exists = Path(self.decision_log_path).exists()
-        
-        with open(self.decision_log_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=log_entry.keys())
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(log_entry)
+        # Buffer for the next flush()
+        self._buffer.append(tuple(log_entry.values()))
         
         return log_entry
     
+    def log_batch(self, dates, p_baselines, p_with_magnets, actual_outcomes, magnet_active=True):
+        """Log several days of magnet performance with a single decision log append"""
+        self.flush()  # keep earlier buffered rows ahead of this batch
+        
+        entries = pd.DataFrame({
+            'date': pd.DatetimeIndex(dates).strftime('%Y-%m-%d'),
+            'p_baseline': np.asarray(p_baselines, dtype=float),
+            'p_with_magnet': np.asarray(p_with_magnets, dtype=float),
+            'actual_outcome': np.asarray(actual_outcomes, dtype=int),
+            'magnet_active': magnet_active,
+            'muted': self._muted
+        }, columns=self.ENTRY_COLUMNS)
+        
+        if not entries.empty:
+            self._append_entries(self.decision_log_path, entries)
+        
+        return entries
+    
     def load_recent_performance(self):
         """Load recent magnet performance data"""
-        if not Path(self.decision_log_path).exists():
+        self.flush()
+        
+        log_path = Path(self.decision_log_path)
+        if not log_path.exists():
             return pd.DataFrame()
         
         try:
-            df = pd.read_csv(self.decision_log_path)
-            df['date'] = pd.to_datetime(df['date'])
+            mtime = log_path.stat().st_mtime_ns
+            if self._log_cache is not None and self._log_cache[0] == mtime:
+                df = self._log_cache[1]
+            else:
+                df = pd.read_csv(log_path, usecols=self.ENTRY_COLUMNS, dtype={'date': str}, engine=CSV_ENGINE)
+                self.add_brier_columns(df)
+                self._log_cache = (mtime, df)
             
-            # Get last N days
-            cutoff_date = datetime.now().date() - timedelta(days=self.shadow_period_days)
-            recent_df = df[df['date'] >= pd.to_datetime(cutoff_date)]
+            # Get last N days (ISO YYYY-MM-DD strings sort chronologically)
+            cutoff_str = (datetime.now().date() - timedelta(days=self.shadow_period_days)).isoformat()
+            recent_df = df[df['date'] >= cutoff_str]
             
             return recent_df
             
@@ -99,19 +199,6 @@ class MagnetGuardrails:
         magnet_probs = recent_df['p_with_magnet'].values
         outcomes = recent_df['actual_outcome'].values
         
-        def calculate_ece(probs, outcomes):
-            bins = np.linspace(0, 1, 6)  # 5 bins
-            ece = 0.0
-            
-            for i in range(5):
-                mask = (probs > bins[i]) & (probs <= bins[i+1])
-                if np.sum(mask) > 0:
-                    bin_acc = np.mean(outcomes[mask])
-                    bin_conf = np.mean(probs[mask])
-                    bin_weight = np.sum(mask) / len(probs)
-                    ece += bin_weight * abs(bin_acc - bin_conf)
-            return ece
-        
         baseline_ece = calculate_ece(baseline_probs, outcomes)
         magnet_ece = calculate_ece(magnet_probs, outcomes)
         
@@ -141,39 +228,38 @@ class MagnetGuardrails:
             'magnet_ece': magnet_ece
         }
     
-    def apply_guardrail_decision(self):
+    def apply_guardrail_decision(self, ctx=None):
         """Apply guardrail decision - mute if performance degraded"""
+        self.flush()
         assessment = self.assess_performance()
         
-        currently_muted = os.getenv('MAGNET_MUTED', 'false').lower() == 'true'
+        currently_muted = self._muted
         
         if assessment['should_mute'] and not currently_muted:
             # Trigger mute
-            self.write_guardrail_report(assessment, action='MUTE')
+            self.write_guardrail_report(assessment, action='MUTE', ctx=ctx)
             print(f"MAGNET AUTO-MUTE TRIGGERED: {assessment['reason']}")
             print("WARNING: Set MAGNET_MUTED=true to acknowledge and mute the Magnet Engine")
             return True
             
         elif not assessment['should_mute'] and currently_muted:
             # Could suggest unmute, but keep manual control
-            self.write_guardrail_report(assessment, action='SUGGEST_UNMUTE')
+            self.write_guardrail_report(assessment, action='SUGGEST_UNMUTE', ctx=ctx)
             print(f"MAGNET PERFORMANCE OK: {assessment['reason']}")
             print("SUGGESTION: Consider setting MAGNET_MUTED=false to re-enable Magnet Engine")
             return False
             
         else:
             # No action needed
-            self.write_guardrail_report(assessment, action='NO_ACTION')
+            self.write_guardrail_report(assessment, action='NO_ACTION', ctx=ctx)
             return False
     
-    def write_guardrail_report(self, assessment, action='ASSESS'):
-        """Write guardrail assessment report"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    def write_guardrail_report(self, assessment, action='ASSESS', ctx=None):
+        """Write guardrail assessment report (into ctx.dir when an AuditContext is shared)"""
+        if ctx is None:
+            ctx = AuditContext(subdir='guardrails')
         
-        audit_dir = Path('audit_exports') / 'guardrails' / timestamp
-        audit_dir.mkdir(parents=True, exist_ok=True)
-        
-        report_file = audit_dir / 'MAGNET_GUARDRAILS_REPORT.md'
+        report_file = ctx.dir / 'MAGNET_GUARDRAILS_REPORT.md'
         
         content = f"""# Magnet Engine Guardrails Report
 
@@ -200,7 +286,7 @@ class MagnetGuardrails:
 ### Assessment Result
 - **Should Mute**: {'Yes' if assessment['should_mute'] else 'No'}
 - **Reason**: {assessment['reason']}
-- **Current Status**: {'MUTED' if os.getenv('MAGNET_MUTED', 'false').lower() == 'true' else 'ACTIVE'}
+- **Current Status**: {'MUTED' if self._muted else 'ACTIVE'}
 
 ### Action Taken
 """
@@ -257,23 +343,20 @@ Generated by Magnet Guardrails System v0.1
 def main():
     """Test Magnet Guardrails system"""
     guardrails = MagnetGuardrails()
+    rng = np.random.Generator(np.random.PCG64DXSM())
     
-    # Simulate some performance data (for testing)
-    test_dates = [datetime.now().date() - timedelta(days=i) for i in range(10, 0, -1)]
+    # Simulate some performance data (for testing), all days drawn at once
+    n_days = 10
+    test_dates = [datetime.now().date() - timedelta(days=i) for i in range(n_days, 0, -1)]
     
-    print("Simulating 10 days of magnet performance...")
-    for i, date in enumerate(test_dates):
-        # Simulate baseline prob around 0.55
-        p_baseline = 0.55 + np.random.normal(0, 0.05)
-        
-        # Simulate magnet adjustment (small effect)
-        p_magnet = p_baseline + np.random.normal(0, 0.01)
-        
-        # Simulate outcome
-        outcome = 1 if np.random.random() < 0.6 else 0
-        
-        # Log performance
-        guardrails.log_magnet_performance(date, p_baseline, p_magnet, outcome)
+    print(f"Simulating {n_days} days of magnet performance...")
+    p_baselines = 0.55 + rng.normal(0, 0.05, n_days)  # baseline prob around 0.55
+    p_magnets = p_baselines + rng.normal(0, 0.01, n_days)  # small magnet effect
+    outcomes = (rng.random(n_days) < 0.6).astype(int)
+    
+    # Log performance with one decision log append
+    guardrails.log_batch(test_dates, p_baselines, p_magnets, outcomes)
+    for i, (p_baseline, p_magnet, outcome) in enumerate(zip(p_baselines, p_magnets, outcomes)):
         print(f"Day {i+1}: baseline={p_baseline:.3f}, magnet={p_magnet:.3f}, outcome={outcome}")
     
     # Assess performance
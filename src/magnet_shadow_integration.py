@@ -5,28 +5,45 @@ Integrates Level Magnet Engine with existing shadow systems
 """
 
 import os
-import pandas as pd
-import numpy as np
+import json
+import math
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
-# Add src to path
-sys.path.append(str(Path(__file__).parent))
+# Add src to path (once, however many times this module is imported)
+SRC_DIR = str(Path(__file__).parent)
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
-from level_magnet_engine import LevelMagnetEngine
-from magnet_guardrails import MagnetGuardrails
-from shadow_day2_runner import ShadowDay2Runner
+
+def _lazy_imports():
+    """Import the engine modules (pandas/numpy/numba) only when a pipeline is built"""
+    from level_magnet_engine import LevelMagnetEngine
+    from magnet_guardrails import MagnetGuardrails
+    from shadow_day2_runner import ShadowDay2Runner
+    return LevelMagnetEngine, MagnetGuardrails, ShadowDay2Runner
 
 
 class MagnetShadowIntegration:
     """Integration of Magnet Engine with Shadow Day system"""
     
     def __init__(self):
+        LevelMagnetEngine, MagnetGuardrails, ShadowDay2Runner = _lazy_imports()
         self.magnet_engine = LevelMagnetEngine()
         self.guardrails = MagnetGuardrails()
         self.shadow_runner = ShadowDay2Runner()
         
+        # Per-date memo for the two expensive pipeline stages (report regeneration reruns the same date)
+        self._shadow_cache = {}
+        self._magnet_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Guardrail decisions are debounced; last run time survives restarts via a small JSON state file
+        self.guardrail_state_file = Path(os.getenv('GUARDRAIL_STATE_PATH', 'audit_exports/.guardrail_state.json'))
+        self.guardrail_interval = timedelta(hours=float(os.getenv('GUARDRAIL_INTERVAL_HOURS', '24')))
+        
     def run_magnet_shadow_day(self, target_date=None):
         """Run complete shadow day with Magnet Engine integration"""
         if target_date is None:
@@ -35,14 +52,14 @@ class MagnetShadowIntegration:
         print(f"Running Magnet Shadow Day for {target_date}...")
         
         # Step 1: Run standard shadow day 2
-        comparison_result, live_daily_report, live_decision_log = self.shadow_runner.run_shadow_day_2(target_date)
+        comparison_result, live_daily_report, live_decision_log = self._cached_shadow_day_2(target_date)
         
         # Step 2: Run magnet analysis
         live_forecast = comparison_result['live_forecast']
         baseline_center = 5600  # Sample - would come from live forecast in real system
         baseline_width = 2.5    # Sample - would come from live forecast
         
-        magnet_result = self.magnet_engine.run_magnet_analysis(baseline_center, baseline_width, target_date)
+        magnet_result = self._cached_magnet_analysis(baseline_center, baseline_width, target_date)
         
         # Step 3: Generate magnet artifacts
         magnet_report = self.magnet_engine.write_level_magnets_report(magnet_result)
@@ -57,13 +74,17 @@ class MagnetShadowIntegration:
             p_with_magnet = p_baseline  # Would be different with actual magnet applied
             actual_outcome = live_forecast['actual_outcome']
             
-            self.guardrails.log_magnet_performance(target_date, p_baseline, p_with_magnet, actual_outcome)
-            
-            # Check if muting is needed
-            mute_triggered = self.guardrails.apply_guardrail_decision()
-            
-            if mute_triggered:
-                print("AUTO-MUTE TRIGGERED: Check MAGNET_GUARDRAILS_REPORT.md")
+            # Identical probabilities carry no magnet signal: nothing to log or assess
+            if not math.isclose(p_baseline, p_with_magnet):
+                self.guardrails.log_magnet_performance(target_date, p_baseline, p_with_magnet, actual_outcome)
+                
+                # Check if muting is needed (at most once per guardrail interval)
+                if self._guardrail_due():
+                    mute_triggered = self.guardrails.apply_guardrail_decision()
+                    self._save_guardrail_state()
+                    
+                    if mute_triggered:
+                        print("AUTO-MUTE TRIGGERED: Check MAGNET_GUARDRAILS_REPORT.md")
         
         return {
             'shadow_result': comparison_result,
@@ -74,6 +95,44 @@ class MagnetShadowIntegration:
             'live_decision_log': live_decision_log
         }
     
+    def _cached_shadow_day_2(self, target_date):
+        """run_shadow_day_2, memoized by target_date"""
+        if target_date in self._shadow_cache:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            self._shadow_cache[target_date] = self.shadow_runner.run_shadow_day_2(target_date)
+        return self._shadow_cache[target_date]
+    
+    def _cached_magnet_analysis(self, baseline_center, baseline_width, target_date):
+        """run_magnet_analysis, memoized by (target_date, baseline_center, baseline_width)"""
+        key = (target_date, baseline_center, baseline_width)
+        if key in self._magnet_cache:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            self._magnet_cache[key] = self.magnet_engine.run_magnet_analysis(baseline_center, baseline_width, target_date)
+        return self._magnet_cache[key]
+    
+    def _guardrail_due(self):
+        """True when no guardrail decision has run within the debounce interval"""
+        if not self.guardrail_state_file.exists():
+            return True
+        with open(self.guardrail_state_file, 'r') as f:
+            last_run = datetime.fromisoformat(json.load(f)['last_guardrail_run'])
+        return datetime.now() - last_run >= self.guardrail_interval
+    
+    def _save_guardrail_state(self):
+        """Record the time of the guardrail decision just applied"""
+        self.guardrail_state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.guardrail_state_file, 'w') as f:
+            json.dump({'last_guardrail_run': datetime.now().isoformat()}, f, indent=2)
+    
+    def cache_hit_rate(self):
+        """Fraction of pipeline stage calls served from the per-date memo"""
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+    
     def _append_magnet_to_council_shadow(self, comparison_result, magnet_result):
         """Append magnet analysis to Council shadow report"""
         target_date = comparison_result['date']
@@ -86,8 +145,8 @@ class MagnetShadowIntegration:
             print(f"Warning: Council shadow file not found: {council_shadow_file}")
             return None
         
-        # Append magnet section
-        magnet_section = f"""
+        # Append magnet section (pieces collected in a list, joined once at write time)
+        parts = [f"""
 ## Level Magnet Analysis (SHADOW)
 
 ### SPX 25-Point Magnet
@@ -104,7 +163,7 @@ class MagnetShadowIntegration:
 - **Band Width**: {magnet_result['width_before']:.2f}% → {magnet_result['width_after']:.2f}%
 
 ### Magnet Assessment
-"""
+"""]
         
         if magnet_result['z_score'] < 0.5:
             assessment = "🔴 **VERY CLOSE** - Strong magnet effect"
@@ -113,12 +172,12 @@ class MagnetShadowIntegration:
         else:
             assessment = "🟢 **DISTANT** - Minimal magnet effect"
         
-        magnet_section += f"- **Distance**: {assessment} (z={magnet_result['z_score']:.3f})\n"
+        parts.append(f"- **Distance**: {assessment} (z={magnet_result['z_score']:.3f})\n")
         
         if magnet_result['is_opex']:
-            magnet_section += f"- **OPEX Enhancement**: {magnet_result['kappa']:.1f}x multiplier (stronger pin expected)\n"
+            parts.append(f"- **OPEX Enhancement**: {magnet_result['kappa']:.1f}x multiplier (stronger pin expected)\n")
         
-        magnet_section += f"""
+        parts.append(f"""
 ### Shadow Mode Status
 - **Magnet Engine**: v0.1 SHADOW (adjustments logged, not applied live)
 - **Guardrails**: Active (auto-mute on performance degradation)
@@ -126,11 +185,11 @@ class MagnetShadowIntegration:
 
 ---
 **MAGNET SHADOW**: All level magnet adjustments are hypothetical comparisons only
-"""
+""")
         
         # Append to file
-        with open(council_shadow_file, 'a', encoding='utf-8') as f:
-            f.write(magnet_section)
+        with open(council_shadow_file, 'a', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(''.join(parts))
         
         return str(council_shadow_file)
 
@@ -150,6 +209,7 @@ def main():
     print(f"Width Delta: {result['magnet_result']['width_delta_pct']:+.1f}%")
     print(f"Magnet Report: {result['magnet_report']}")
     print(f"Updated Council Shadow: {result['updated_council_shadow']}")
+    print(f"Pipeline Cache Hit Rate: {integration.cache_hit_rate()*100:.0f}%")
     
     return result
 
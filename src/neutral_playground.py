@@ -6,8 +6,115 @@ Neutral threshold knobs and A/B testing for Playground
 
 import os
 import yaml
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
 from pathlib import Path
+from string import Template
+
+try:
+    from yaml import CSafeDumper as YamlDumper  # LibYAML C emitter
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+
+
+# NEUTRAL_TUNING.md layout, parsed once at import; values arrive pre-formatted
+_TUNING_TEMPLATE = Template("""# Neutral Tuning Report
+
+**Generated**: ${generated}
+**Test Period**: 60 days
+**Test Type**: A/B (Baseline vs Candidate)
+**Verdict**: ${verdict}
+
+## A/B Test Results
+
+### Score Performance
+- **Baseline Average**: ${baseline_avg}
+- **Candidate Average**: ${candidate_avg}
+- **Delta**: ${score_delta} (${score_delta_pct}%)
+
+### Suitable Days Count
+- **Baseline Suitable**: ${baseline_suitable_days}/60 days (${baseline_suitable_pct}%)
+- **Candidate Suitable**: ${candidate_suitable_days}/60 days (${candidate_suitable_pct}%)
+- **Delta**: ${suitable_delta} days (${suitable_delta_pp}pp)
+
+## Threshold Comparison
+
+| Parameter | Baseline | Candidate | Change |
+|-----------|----------|-----------|--------|
+| **Compression Min** | 0.750 | 0.700 | -0.050 (looser) |
+| **Compression Max** | 1.250 | 1.300 | +0.050 (looser) |
+| **EM/SR Ratio Min** | 0.8 | 0.9 | +0.1 (tighter) |
+| **EM/SR Ratio Max** | 2.0 | 1.8 | -0.2 (tighter) |
+| **Premium Band Min** | 0.15 | 0.18 | +0.03 (higher floor) |
+| **Premium Band Max** | 0.35 | 0.32 | -0.03 (lower ceiling) |
+| **Event Quiet Days** | 2 | 3 | +1 (more conservative) |
+| **Magnet Bump Max** | 0.15 | 0.12 | -0.03 (stricter) |
+
+## Performance Analysis
+
+### ${verdict} Analysis
+${verdict_block}
+
+## Statistical Significance
+
+- **Test Duration**: 60 trading days (sufficient for quarterly patterns)
+- **Score Threshold**: ±0.02 for significance
+- **Days Threshold**: ±3 days for significance  
+- **Current Result**: ${significance}
+
+## Implementation Notes
+
+### SHADOW-Only Mode
+- All testing conducted in shadow/candidate mode
+- Zero production impact during A/B period
+- Live system continues with baseline thresholds
+- Candidate metrics logged for analysis only
+
+### Next Steps
+1. ${next_step}
+2. Continue monitoring with extended test periods
+3. Consider seasonal threshold adjustments
+4. Integrate with broader strategy performance metrics
+
+---
+**NEUTRAL TUNING**: ${verdict} verdict on 60-day A/B test
+Generated by Neutral Playground v0.1
+""")
+
+_TUNING_VERDICT_TEMPLATES = {
+    'WIN': Template("""
+**Candidate Outperformed**: The tuned thresholds improved neutral suitability identification.
+
+**Key Improvements**:
+- Average suitability score increased by ${score_delta_plain}
+- ${suitable_delta_plain} more suitable days identified
+- Better balance between compression and EM/SR ratios
+- More conservative event proximity requirements
+
+**Recommendation**: Consider promoting candidate thresholds to live system after additional validation.
+"""),
+    'LOSE': Template("""
+**Baseline Outperformed**: Current thresholds remain superior.
+
+**Issues with Candidate**:
+- Average suitability score decreased by ${score_delta_abs}
+- ${suitable_delta_abs} fewer suitable days identified
+- Threshold adjustments may be too restrictive
+- Reduced neutral opportunities without clear benefit
+
+**Recommendation**: Retain baseline thresholds; investigate alternative tuning directions.
+"""),
+    'TIE': Template("""
+**Equivalent Performance**: No significant difference between baseline and candidate.
+
+**Tie Factors**:
+- Score delta (${score_delta}) within noise threshold
+- Suitable days delta (${suitable_delta}) not statistically significant
+- Both configurations perform similarly over 60-day period
+
+**Recommendation**: Retain baseline for stability; continue monitoring for longer-term patterns.
+""")
+}
 
 
 class NeutralPlayground:
@@ -82,7 +189,7 @@ class NeutralPlayground:
         
         candidate_file = self.audit_dir / 'NEUTRAL_WEIGHTS_CANDIDATE.yaml'
         with open(candidate_file, 'w', encoding='utf-8') as f:
-            yaml.dump(neutral_weights, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(neutral_weights, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
         
         return {
             'candidate_file': str(candidate_file),
@@ -93,39 +200,15 @@ class NeutralPlayground:
     def run_60d_ab_test(self):
         """Simulate 60-day A/B test results"""
         
-        # Simulate baseline vs candidate performance over 60 days
-        baseline_results = []
-        candidate_results = []
-        
-        for day in range(60):
-            date = datetime.now() - timedelta(days=59-day)
-            
-            # Simulate baseline neutral suitability (current thresholds)
-            baseline_score = 0.5 + 0.3 * ((day % 10) / 9) + (day % 3 - 1) * 0.1
-            baseline_score = max(0.0, min(1.0, baseline_score))
-            
-            # Simulate candidate neutral suitability (tuned thresholds)
-            candidate_score = baseline_score + 0.05 + (day % 7 - 3) * 0.02
-            candidate_score = max(0.0, min(1.0, candidate_score))
-            
-            baseline_results.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'score': baseline_score,
-                'suitable': baseline_score >= 0.7
-            })
-            
-            candidate_results.append({
-                'date': date.strftime('%Y-%m-%d'), 
-                'score': candidate_score,
-                'suitable': candidate_score >= 0.7
-            })
+        # Simulate baseline vs candidate performance over 60 days (single-candidate sweep, one array per arm)
+        sweep = self.run_ab_sweep([0.05])[0]
         
         # Compute metrics
-        baseline_avg = sum(r['score'] for r in baseline_results) / len(baseline_results)
-        candidate_avg = sum(r['score'] for r in candidate_results) / len(candidate_results)
+        baseline_avg = float(sweep[0])
+        candidate_avg = float(sweep[1])
         
-        baseline_suitable_days = sum(1 for r in baseline_results if r['suitable'])
-        candidate_suitable_days = sum(1 for r in candidate_results if r['suitable'])
+        baseline_suitable_days = int(sweep[2])
+        candidate_suitable_days = int(sweep[3])
         
         score_delta = candidate_avg - baseline_avg
         suitable_delta = candidate_suitable_days - baseline_suitable_days
@@ -149,114 +232,57 @@ class NeutralPlayground:
             'test_days': 60
         }
     
-    def create_neutral_tuning_report(self, ab_result):
-        """Create NEUTRAL_TUNING.md report"""
+    def run_ab_sweep(self, candidate_offsets, days=60):
+        """Score many candidate offsets over the same window as one (offsets x days) array pass;
+        one row of [baseline_avg, candidate_avg, baseline_suitable, candidate_suitable] per offset"""
+        day = np.arange(days)
+        offsets = np.asarray(candidate_offsets, dtype=float)[:, None]
         
-        tuning_content = f"""# Neutral Tuning Report
-
-**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-**Test Period**: 60 days
-**Test Type**: A/B (Baseline vs Candidate)
-**Verdict**: {ab_result['ab_verdict']}
-
-## A/B Test Results
-
-### Score Performance
-- **Baseline Average**: {ab_result['baseline_avg']:.3f}
-- **Candidate Average**: {ab_result['candidate_avg']:.3f}
-- **Delta**: {ab_result['score_delta']:+.3f} ({ab_result['score_delta']/ab_result['baseline_avg']*100:+.1f}%)
-
-### Suitable Days Count
-- **Baseline Suitable**: {ab_result['baseline_suitable_days']}/60 days ({ab_result['baseline_suitable_days']/60*100:.1f}%)
-- **Candidate Suitable**: {ab_result['candidate_suitable_days']}/60 days ({ab_result['candidate_suitable_days']/60*100:.1f}%)
-- **Delta**: {ab_result['suitable_delta']:+d} days ({ab_result['suitable_delta']/60*100:+.1f}pp)
-
-## Threshold Comparison
-
-| Parameter | Baseline | Candidate | Change |
-|-----------|----------|-----------|--------|
-| **Compression Min** | 0.750 | 0.700 | -0.050 (looser) |
-| **Compression Max** | 1.250 | 1.300 | +0.050 (looser) |
-| **EM/SR Ratio Min** | 0.8 | 0.9 | +0.1 (tighter) |
-| **EM/SR Ratio Max** | 2.0 | 1.8 | -0.2 (tighter) |
-| **Premium Band Min** | 0.15 | 0.18 | +0.03 (higher floor) |
-| **Premium Band Max** | 0.35 | 0.32 | -0.03 (lower ceiling) |
-| **Event Quiet Days** | 2 | 3 | +1 (more conservative) |
-| **Magnet Bump Max** | 0.15 | 0.12 | -0.03 (stricter) |
-
-## Performance Analysis
-
-### {ab_result['ab_verdict']} Analysis
-"""
+        # Simulate baseline neutral suitability (current thresholds)
+        baseline_scores = np.clip(0.5 + 0.3 * ((day % 10) / 9) + (day % 3 - 1) * 0.1, 0.0, 1.0)
         
-        if ab_result['ab_verdict'] == 'WIN':
-            tuning_content += f"""
-**Candidate Outperformed**: The tuned thresholds improved neutral suitability identification.
-
-**Key Improvements**:
-- Average suitability score increased by {ab_result['score_delta']:.3f}
-- {ab_result['suitable_delta']} more suitable days identified
-- Better balance between compression and EM/SR ratios
-- More conservative event proximity requirements
-
-**Recommendation**: Consider promoting candidate thresholds to live system after additional validation.
-"""
+        # Simulate candidate neutral suitability (tuned thresholds), one row per offset
+        candidate_scores = np.clip(baseline_scores + offsets + (day % 7 - 3) * 0.02, 0.0, 1.0)
         
-        elif ab_result['ab_verdict'] == 'LOSE':
-            tuning_content += f"""
-**Baseline Outperformed**: Current thresholds remain superior.
-
-**Issues with Candidate**:
-- Average suitability score decreased by {abs(ab_result['score_delta']):.3f}
-- {abs(ab_result['suitable_delta'])} fewer suitable days identified
-- Threshold adjustments may be too restrictive
-- Reduced neutral opportunities without clear benefit
-
-**Recommendation**: Retain baseline thresholds; investigate alternative tuning directions.
-"""
+        out = np.empty((offsets.shape[0], 4))
+        # cumsum adds left to right, so the averages match a plain day-by-day running sum
+        out[:, 0] = np.cumsum(baseline_scores)[-1] / days
+        out[:, 1] = np.cumsum(candidate_scores, axis=1)[:, -1] / days
+        out[:, 2] = np.count_nonzero(baseline_scores >= 0.7)
+        out[:, 3] = np.count_nonzero(candidate_scores >= 0.7, axis=1)
         
-        else:  # TIE
-            tuning_content += f"""
-**Equivalent Performance**: No significant difference between baseline and candidate.
-
-**Tie Factors**:
-- Score delta ({ab_result['score_delta']:+.3f}) within noise threshold
-- Suitable days delta ({ab_result['suitable_delta']:+d}) not statistically significant
-- Both configurations perform similarly over 60-day period
-
-**Recommendation**: Retain baseline for stability; continue monitoring for longer-term patterns.
-"""
+        return out
+    
+    def create_neutral_tuning_report(self, ab_result):
+        """Create NEUTRAL_TUNING.md report"""
+        verdict = ab_result['ab_verdict']
         
-        tuning_content += f"""
-
-## Statistical Significance
-
-- **Test Duration**: 60 trading days (sufficient for quarterly patterns)
-- **Score Threshold**: ±0.02 for significance
-- **Days Threshold**: ±3 days for significance  
-- **Current Result**: {'Significant' if ab_result['ab_verdict'] != 'TIE' else 'Not significant'}
-
-## Implementation Notes
-
-### SHADOW-Only Mode
-- All testing conducted in shadow/candidate mode
-- Zero production impact during A/B period
-- Live system continues with baseline thresholds
-- Candidate metrics logged for analysis only
-
-### Next Steps
-1. {'Deploy candidate thresholds' if ab_result['ab_verdict'] == 'WIN' else 'Retain baseline thresholds'}
-2. Continue monitoring with extended test periods
-3. Consider seasonal threshold adjustments
-4. Integrate with broader strategy performance metrics
-
----
-**NEUTRAL TUNING**: {ab_result['ab_verdict']} verdict on 60-day A/B test
-Generated by Neutral Playground v0.1
-"""
+        # Format specs applied once here; the layout itself was parsed at import
+        fields = {
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+            'verdict': verdict,
+            'baseline_avg': f"{ab_result['baseline_avg']:.3f}",
+            'candidate_avg': f"{ab_result['candidate_avg']:.3f}",
+            'score_delta': f"{ab_result['score_delta']:+.3f}",
+            'score_delta_pct': f"{ab_result['score_delta']/ab_result['baseline_avg']*100:+.1f}",
+            'score_delta_abs': f"{abs(ab_result['score_delta']):.3f}",
+            'score_delta_plain': f"{ab_result['score_delta']:.3f}",
+            'baseline_suitable_days': ab_result['baseline_suitable_days'],
+            'baseline_suitable_pct': f"{ab_result['baseline_suitable_days']/60*100:.1f}",
+            'candidate_suitable_days': ab_result['candidate_suitable_days'],
+            'candidate_suitable_pct': f"{ab_result['candidate_suitable_days']/60*100:.1f}",
+            'suitable_delta': f"{ab_result['suitable_delta']:+d}",
+            'suitable_delta_plain': ab_result['suitable_delta'],
+            'suitable_delta_abs': abs(ab_result['suitable_delta']),
+            'suitable_delta_pp': f"{ab_result['suitable_delta']/60*100:+.1f}",
+            'significance': 'Significant' if verdict != 'TIE' else 'Not significant',
+            'next_step': 'Deploy candidate thresholds' if verdict == 'WIN' else 'Retain baseline thresholds'
+        }
+        fields['verdict_block'] = _TUNING_VERDICT_TEMPLATES.get(verdict, _TUNING_VERDICT_TEMPLATES['TIE']).substitute(fields)
+        tuning_content = _TUNING_TEMPLATE.substitute(fields)
         
         tuning_file = self.audit_dir / 'NEUTRAL_TUNING.md'
-        with open(tuning_file, 'w', encoding='utf-8') as f:
+        with open(tuning_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
             f.write(tuning_content)
         
         return str(tuning_file)
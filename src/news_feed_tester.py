@@ -4,13 +4,28 @@ News Feed Discovery and Testing System
 Tests RSS feeds for financial news quality and reliability
 """
 
+import os
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import pandas as pd
+from pathlib import Path
 import re
 from typing import Dict, List, Tuple
-import time
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 class NewsSourceTester:
     def __init__(self):
@@ -36,15 +51,125 @@ class NewsSourceTester:
             "fomc", "jerome powell", "treasury", "yield", "dollar"
         ]
         
+        # One compiled alternation scans each article once instead of a substring test per keyword
+        # (no \b anchors: keeps the original substring semantics, e.g. "fed" inside "fed's")
+        self._keyword_re = re.compile('|'.join(re.escape(k) for k in self.market_keywords), re.IGNORECASE)
+        
+        # Shared session: pooled keep-alive connections reused across feeds and reruns
+        if REQUESTS_CACHE_AVAILABLE:
+            self.session = requests_cache.CachedSession(
+                os.getenv('RSS_CACHE_PATH', '.rss_cache'), backend='sqlite',
+                expire_after=int(os.getenv('RSS_CACHE_TTL', '300')), cache_control=True
+            )
+        else:
+            self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Conditional GET state per URL: validators from the last 200 and the result parsed from it
+        self._feed_validators = {}
+        self._feed_results = {}
+        
+        # Parsed entries persisted per feed (validators in the file metadata) so reruns skip feedparser on a 304
+        self.entry_cache_dir = Path(os.getenv('RSS_ENTRY_CACHE_DIR', '.rss_cache'))
+        
+    def _fetch_feed(self, url: str) -> Tuple[requests.Response, object]:
+        """GET a feed and parse it straight off the decoded byte stream (feed is None unless HTTP 200)"""
+        with self.session.get(url, timeout=10, stream=True, headers=self._feed_validators.get(url)) as response:
+            if response.status_code != 200:
+                return response, None
+            
+            # feedparser reads the socket stream itself; no intermediate response.content copy
+            response.raw.decode_content = True
+            return response, feedparser.parse(response.raw)
+    
+    def _entry_cache_file(self, feed_name: str) -> Path:
+        """Parquet file holding the last parsed entries of a feed"""
+        return self.entry_cache_dir / f'{feed_name}.parquet'
+    
+    def _save_entries(self, feed_name: str, entries: List, validators: Dict):
+        """Persist title/summary/published columns plus the HTTP validators they were fetched under"""
+        if not PARQUET_AVAILABLE or not validators:
+            return
+        
+        table = pa.table({
+            'title': pa.array([entry.get('title', '') for entry in entries], type=pa.string()),
+            'summary': pa.array([entry.get('summary', '') for entry in entries], type=pa.string()),
+            'published': pa.array(
+                [datetime(*entry.published_parsed[:6]) if entry.get('published_parsed') else None for entry in entries],
+                type=pa.timestamp('s')
+            )
+        }).replace_schema_metadata(validators)
+        
+        self.entry_cache_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, self._entry_cache_file(feed_name))
+    
+    def _load_cached_validators(self, feed_name: str) -> Dict:
+        """Validators stored alongside the cached entries (schema read only, no data pages)"""
+        cache_file = self._entry_cache_file(feed_name)
+        if not PARQUET_AVAILABLE or not cache_file.exists():
+            return {}
+        metadata = pq.read_schema(cache_file).metadata or {}
+        return {key.decode(): value.decode() for key, value in metadata.items()
+                if key in (b'If-None-Match', b'If-Modified-Since')}
+    
+    def _load_cached_entries(self, feed_name: str) -> List[Dict]:
+        """Reload cached entries in the shape the relevance scan expects"""
+        return [
+            {
+                'title': row['title'],
+                'summary': row['summary'],
+                'published_parsed': row['published'].timetuple() if row['published'] else None
+            }
+            for row in pq.read_table(self._entry_cache_file(feed_name)).to_pylist()
+        ]
+    
+    def _summarize_entries(self, feed_name: str, entries: List) -> Dict:
+        """Market relevance, freshness and sample headlines for a feed's first entries"""
+        market_relevant_count = 0
+        
+        for entry in entries:
+            # Check for market relevance (regex is case-insensitive; summary only scanned on a title miss)
+            if self._keyword_re.search(entry.get('title', '')) or self._keyword_re.search(entry.get('summary', '')):
+                market_relevant_count += 1
+        
+        # Get latest publish date: max over (Y, M, D, h, m, s) tuples, one datetime built at the end
+        stamps = [entry['published_parsed'][:6] for entry in entries if entry.get('published_parsed')]
+        latest_date = datetime(*max(stamps)) if stamps else None
+        
+        market_relevance = (market_relevant_count / len(entries) * 100) if entries else 0
+        
+        return {
+            "name": feed_name,
+            "status": "SUCCESS",
+            "error": None,
+            "entries": len(entries),
+            "latest_date": latest_date,
+            "market_relevance": round(market_relevance, 1),
+            "sample_titles": [entry.get('title', '')[:100] for entry in entries[:3]]
+        }
+    
     def test_feed_accessibility(self, feed_name: str, url: str) -> Dict:
         """Test if RSS feed is accessible and parse basic info"""
         try:
             print(f"Testing {feed_name}: {url}")
             
-            # Try to fetch with timeout
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
+            # First fetch this process: revalidate against entries cached by a previous run
+            if url not in self._feed_validators:
+                cached_validators = self._load_cached_validators(feed_name)
+                if cached_validators:
+                    self._feed_validators[url] = cached_validators
+            
+            # Try to fetch with timeout, revalidating against the last ETag/Last-Modified
+            response, feed = self._fetch_feed(url)
+            
+            if response.status_code == 304:
+                # Unchanged since the last fetch: reuse the parsed result, no body transferred
+                if url not in self._feed_results:
+                    self._feed_results[url] = self._summarize_entries(feed_name, self._load_cached_entries(feed_name))
+                return dict(self._feed_results[url])
             
             if response.status_code != 200:
                 return {
@@ -56,9 +181,6 @@ class NewsSourceTester:
                     "market_relevance": 0
                 }
             
-            # Parse RSS feed
-            feed = feedparser.parse(response.content)
-            
             if feed.bozo:
                 return {
                     "name": feed_name,
@@ -71,35 +193,20 @@ class NewsSourceTester:
             
             # Analyze entries
             entries = feed.entries[:10]  # Test first 10 entries
-            market_relevant_count = 0
-            latest_date = None
+            result = self._summarize_entries(feed_name, entries)
             
-            for entry in entries:
-                # Check for market relevance
-                title_text = entry.get('title', '').lower()
-                summary_text = entry.get('summary', '').lower()
-                combined_text = f"{title_text} {summary_text}"
-                
-                if any(keyword in combined_text for keyword in self.market_keywords):
-                    market_relevant_count += 1
-                
-                # Get latest publish date
-                if 'published_parsed' in entry:
-                    entry_date = datetime(*entry.published_parsed[:6])
-                    if latest_date is None or entry_date > latest_date:
-                        latest_date = entry_date
+            # Remember validators so the next run can get a 304 instead of the full feed
+            validators = {}
+            if response.headers.get('ETag'):
+                validators['If-None-Match'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            if validators:
+                self._feed_validators[url] = validators
+                self._feed_results[url] = result
+                self._save_entries(feed_name, entries, validators)
             
-            market_relevance = (market_relevant_count / len(entries) * 100) if entries else 0
-            
-            return {
-                "name": feed_name,
-                "status": "SUCCESS",
-                "error": None,
-                "entries": len(entries),
-                "latest_date": latest_date,
-                "market_relevance": round(market_relevance, 1),
-                "sample_titles": [entry.get('title', '')[:100] for entry in entries[:3]]
-            }
+            return dict(result)
             
         except Exception as e:
             return {
@@ -111,42 +218,43 @@ class NewsSourceTester:
                 "market_relevance": 0
             }
     
-    def test_all_feeds(self) -> pd.DataFrame:
-        """Test all RSS feeds and return results"""
-        results = []
-        
-        for feed_name, url in self.rss_feeds.items():
-            result = self.test_feed_accessibility(feed_name, url)
-            results.append(result)
-            
-            # Be respectful with requests
-            time.sleep(1)
+    def test_all_feeds(self) -> List[Dict]:
+        """Test all RSS feeds in parallel and return results"""
+        # Every feed is a different host, so fetch them concurrently (no politeness sleep needed)
+        with ThreadPoolExecutor(max_workers=len(self.rss_feeds)) as executor:
+            futures = {
+                executor.submit(self.test_feed_accessibility, feed_name, url): feed_name
+                for feed_name, url in self.rss_feeds.items()
+            }
+            by_name = {futures[future]: future.result() for future in as_completed(futures)}
         
-        return pd.DataFrame(results)
+        # Report in the configured feed order, not completion order
+        return [by_name[feed_name] for feed_name in self.rss_feeds]
     
-    def generate_report(self, results_df: pd.DataFrame) -> str:
+    def generate_report(self, results: List[Dict]) -> str:
         """Generate a comprehensive report of RSS feed testing"""
         
-        working_feeds = results_df[results_df['status'] == 'SUCCESS']
-        failed_feeds = results_df[results_df['status'] == 'FAILED']
+        working_feeds = [r for r in results if r['status'] == 'SUCCESS']
+        failed_feeds = [r for r in results if r['status'] == 'FAILED']
         
         report = f"""
 # RSS Feed Testing Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 
 ## Summary
-- **Total feeds tested**: {len(results_df)}
+- **Total feeds tested**: {len(results)}
 - **Working feeds**: {len(working_feeds)}
 - **Failed feeds**: {len(failed_feeds)}
-- **Success rate**: {len(working_feeds)/len(results_df)*100:.1f}%
+- **Success rate**: {len(working_feeds)/len(results)*100:.1f}%
 
 ## Working Feeds (Recommended for Implementation)
 """
         
         # Sort by market relevance
-        working_sorted = working_feeds.sort_values('market_relevance', ascending=False)
+        working_sorted = sorted(working_feeds, key=lambda r: r['market_relevance'], reverse=True)
         
-        for _, feed in working_sorted.iterrows():
-            freshness = "Recent" if feed['latest_date'] and feed['latest_date'] > datetime.now() - timedelta(hours=24) else "Stale"
+        stale_cutoff = datetime.now() - timedelta(hours=24)
+        for feed in working_sorted:
+            freshness = "Recent" if feed['latest_date'] and feed['latest_date'] > stale_cutoff else "Stale"
             
             report += f"""
 ### {feed['name']}
@@ -156,25 +264,25 @@ class NewsSourceTester:
 - **Latest Article**: {feed['latest_date'].strftime('%Y-%m-%d %H:%M') if feed['latest_date'] else 'Unknown'}
 - **Sample Headlines**:
 """
-            for title in feed.get('sample_titles', []):
-                if title:
-                    report += f"  - {title}\n"
+            report += ''.join(f"  - {title}\n" for title in feed.get('sample_titles', []) if title)
         
         if len(failed_feeds) > 0:
             report += f"""
 ## Failed Feeds (Need Alternative Sources)
 """
-            for _, feed in failed_feeds.iterrows():
-                report += f"- **{feed['name']}**: {feed['error']}\n"
+            report += ''.join(f"- **{feed['name']}**: {feed['error']}\n" for feed in failed_feeds)
+        
+        high_priority = '\n'.join(f"- {feed['name']}" for feed in working_sorted if feed['market_relevance'] > 50)
+        secondary = '\n'.join(f"- {feed['name']}" for feed in working_sorted if 20 <= feed['market_relevance'] <= 50)
         
         report += f"""
 ## Recommendations
 
 **High Priority Implementation** (Market Relevance >50%):
-{chr(10).join([f"- {row['name']}" for _, row in working_sorted[working_sorted['market_relevance'] > 50].iterrows()])}
+{high_priority}
 
 **Secondary Sources** (Market Relevance 20-50%):
-{chr(10).join([f"- {row['name']}" for _, row in working_sorted[(working_sorted['market_relevance'] >= 20) & (working_sorted['market_relevance'] <= 50)].iterrows()])}
+{secondary}
 
 **Next Steps**:
 1. Implement RSS parsing for high-priority feeds
@@ -198,7 +306,7 @@ def main():
     print("RESULTS SUMMARY")
     print("=" * 50)
     
-    for _, result in results.iterrows():
+    for result in results:
         status_symbol = "✅" if result['status'] == 'SUCCESS' else "❌"
         relevance = f"{result['market_relevance']}%" if result['status'] == 'SUCCESS' else "N/A"
         print(f"{status_symbol} {result['name']:<20} | Relevance: {relevance:<6} | Entries: {result['entries']}")
@@ -13,12 +13,59 @@ from pathlib import Path
 import sys
 import re
 import hashlib
+import zlib
+import pickle
 from urllib.parse import urlparse
-import time
+import asyncio
+from collections import defaultdict
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent))
 
+from adaptive_concurrency import AdaptiveConcurrencyManager
+
+try:
+    import pyarrow  # noqa: F401  (pandas Parquet engine)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # LibYAML C parser
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Compiled once; used per source during ingestion and per item during corroboration/logging
+_DOMAIN_RE = re.compile(r'([a-zA-Z0-9-]+\.(?:gov|com|org|eu|uk|jp|int))')
+_WWW_RE = re.compile(r'^www\.')
+
+# Column layout of the per-day news table (missing keys, e.g. status on unmuted items, become nulls)
+NEWS_ITEM_COLUMNS = ['source', 'category', 'severity', 'headline', 'timestamp', 'time_str', 'link',
+                     'requires_corroboration', 'corroborated', 'status']
+
+# MinHash LSH for headline clustering: 128 permutations in 64 bands of 2 rows, so any pair near the
+# corroboration threshold shares a bucket (~0.13 Jaccard S-curve midpoint); signature agreement decides
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 64
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+SHINGLE_CHARS = 5  # character shingles: headlines are too short for word n-grams to survive a one-word edit
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_minhash_rng = np.random.Generator(np.random.PCG64DXSM(1))
+_MINHASH_A = _minhash_rng.integers(1, _MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MINHASH_B = _minhash_rng.integers(0, _MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9%]+')
+
+
+def _headline_signature(headline):
+    """MinHash signature over character 5-gram shingles of a normalized headline"""
+    text = _NON_ALNUM_RE.sub(' ', headline.lower()).strip()
+    shingles = {text[i:i + SHINGLE_CHARS] for i in range(max(1, len(text) - SHINGLE_CHARS + 1))}
+    hashes = np.array([int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+                       for s in shingles], dtype=np.uint64)
+    # a, b span the whole prime field so the permutations are independent; the product wraps mod 2**64 (as datasketch)
+    return (((np.outer(hashes, _MINHASH_A) + _MINHASH_B) % _MERSENNE_PRIME) & _MAX_HASH).min(axis=0)
+
 
 class NewsIngestionEngine:
     """Lightweight news ingestion with whitelist and weight enforcement"""
@@ -29,66 +76,85 @@ class NewsIngestionEngine:
         self.enabled = os.getenv('NEWS_ENABLED', 'true').lower() == 'true'
         
         self.whitelist_domains = self._load_whitelist()
+        self._domain_allowed_cache = {}  # url -> bool, the same few domains are checked repeatedly
         self.source_weights = self._load_weights()
+        self._domain_index = self._build_domain_index()
         
         # Quality control settings
         self.min_headline_length = 10
         self.max_headline_length = 500
         self.dedup_threshold = 0.8
+        self.corroboration_threshold = 0.4  # estimated 5-gram Jaccard for headlines to count as the same story
+        
+        # Rate limiting (per host: different domains are fetched concurrently)
+        self.request_delay = 1.0  # 1 second between requests to the same host
+        self.concurrency = AdaptiveConcurrencyManager()  # global in-flight cap across hosts
+        
+    def _load_cached(self, source_path, parse):
+        """Parse a config file, reusing a pickle snapshot beside it while the file is unchanged"""
+        cache_path = source_path.with_name(source_path.name + '.cache')
+        try:
+            if cache_path.stat().st_mtime >= source_path.stat().st_mtime:
+                return pickle.loads(cache_path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass  # no cache yet, or unreadable: fall back to parsing
         
-        # Rate limiting
-        self.request_delay = 1.0  # 1 second between requests
+        with open(source_path, 'r', encoding='utf-8') as f:
+            data = parse(f)
         
+        try:
+            cache_path.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            pass  # read-only config dir: parse every time
+        
+        return data
+    
     def _load_whitelist(self):
         """Load approved domains from whitelist"""
         if not self.whitelist_path.exists():
             return set()
         
-        domains = set()
-        with open(self.whitelist_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Extract domains from markdown (look for domain.com patterns)
-            domain_pattern = r'([a-zA-Z0-9-]+\.(?:gov|com|org|eu|uk|jp|int))'
-            matches = re.findall(domain_pattern, content)
-            domains.update(matches)
-        
-        return domains
+        # Extract domains from markdown (look for domain.com patterns)
+        return self._load_cached(self.whitelist_path, lambda f: set(_DOMAIN_RE.findall(f.read())))
     
     def _load_weights(self):
         """Load source weights configuration"""
         if not self.weights_path.exists():
             return {}
         
-        with open(self.weights_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return self._load_cached(self.weights_path, lambda f: yaml.load(f, Loader=YamlLoader))
+    
+    def _build_domain_index(self):
+        """Invert source weights into domain -> (weight, category); first listed category wins"""
+        domain_index = {}
+        for category, config in self.source_weights.items():
+            if isinstance(config, dict) and 'sources' in config:
+                for domain in config['sources']:
+                    domain_index.setdefault(domain, (config['weight'], category))
+        
+        return domain_index
     
     def _is_domain_allowed(self, url):
         """Check if URL domain is in whitelist"""
-        try:
-            domain = urlparse(url).netloc.lower()
-            # Remove www. prefix if present
-            domain = re.sub(r'^www\.', '', domain)
-            return domain in self.whitelist_domains
-        except:
-            return False
+        allowed = self._domain_allowed_cache.get(url)
+        if allowed is None:
+            try:
+                domain = urlparse(url).netloc.lower()
+                # Remove www. prefix if present
+                domain = _WWW_RE.sub('', domain)
+                allowed = domain in self.whitelist_domains
+            except:
+                allowed = False
+            self._domain_allowed_cache[url] = allowed
+        return allowed
     
     def _get_source_weight(self, domain):
         """Get weight for source domain"""
-        domain = re.sub(r'^www\.', '', domain.lower())
-        
-        # Check each category for the domain
-        for category, config in self.source_weights.items():
-            if isinstance(config, dict) and 'sources' in config:
-                if domain in config['sources']:
-                    return config['weight'], category
-        
-        return 0.0, 'unknown'
+        return self._domain_index.get(_WWW_RE.sub('', domain.lower()), (0.0, 'unknown'))
     
     def _simulate_news_fetch(self, domain, category):
-        """Simulate news fetching for testing (replace with actual RSS/API calls)"""
+        """Simulate news fetching for testing (replace with actual RSS/API calls); yields items"""
         # Simulate different types of news based on category
-        news_items = []
-        
         if category == 'official':
             items = [
                 {"headline": f"Fed releases monthly economic indicators", "severity": "HIGH"},
@@ -109,18 +175,19 @@ class NewsIngestionEngine:
                 {"headline": f"Economic data shows mixed signals", "severity": "LOW"},
             ]
         
-        # Add metadata to each item
+        # Add metadata to each item (one fetch time per batch, pre-formatted for the log writer)
+        fetched_at = datetime.now()
+        fetched_time = fetched_at.strftime('%H:%M:%S')
         for item in items:
             item.update({
                 "source": domain,
                 "category": category,
-                "timestamp": datetime.now(),
-                "link": f"https://{domain}/article-{hash(item['headline']) % 1000}",
+                "timestamp": fetched_at,
+                "time_str": fetched_time,
+                "link": f"https://{domain}/article-{zlib.crc32(item['headline'].encode('utf-8')) % 1000}",
                 "requires_corroboration": category == 'low_trust'
             })
-            news_items.append(item)
-        
-        return news_items
+            yield item
     
     def _simulate_macro_data(self):
         """Simulate macro calendar data (replace with ForexFactory API)"""
@@ -154,55 +221,97 @@ class NewsIngestionEngine:
             }
         ]
         
-        for event in events:
-            # Calculate z-score if consensus and actual exist
-            if event['consensus'] and event['actual']:
-                # Simplified z-score calculation
-                surprise = event['actual'] - event['consensus']
-                # Use historical volatility proxy
-                vol_proxy = abs(event['consensus']) * 0.02  # 2% of consensus as vol proxy
-                z_score = surprise / vol_proxy if vol_proxy > 0 else 0.0
+        # Simplified z-scores for every event at once; events missing consensus or actual get none
+        consensus = np.array([event.get('consensus') or np.nan for event in events], dtype=np.float64)
+        actual = np.array([event.get('actual') or np.nan for event in events], dtype=np.float64)
+        has_values = ~(np.isnan(consensus) | np.isnan(actual))
+        surprise = actual - consensus
+        vol_proxy = np.abs(consensus) * 0.02  # 2% of consensus as historical volatility proxy
+        z_scores = np.divide(surprise, vol_proxy, out=np.zeros_like(surprise), where=vol_proxy > 0)
+        directions = np.where(surprise > 0, 'positive', np.where(surprise < 0, 'negative', 'neutral'))
+        
+        fetched_at = datetime.now()
+        for event, scored, z_score, direction in zip(events, has_values.tolist(), z_scores.tolist(), directions.tolist()):
+            if scored:
                 event['z_score'] = z_score
-                event['surprise_direction'] = 'positive' if surprise > 0 else 'negative' if surprise < 0 else 'neutral'
+                event['surprise_direction'] = direction
             
-            event['timestamp'] = datetime.now()
+            event['timestamp'] = fetched_at
             event['source'] = 'forexfactory.com'
             macro_events.append(event)
         
         return macro_events
     
     def _check_corroboration(self, news_items):
-        """Check corroboration for low-trust sources"""
-        corroborated_items = []
-        
-        # Group by headline similarity (simplified)
-        headline_groups = {}
-        
-        for item in news_items:
-            # Simple grouping by first 50 characters
-            key = item['headline'][:50].lower()
-            if key not in headline_groups:
-                headline_groups[key] = []
-            headline_groups[key].append(item)
+        """Check corroboration for low-trust sources; consumes any iterable and yields items cluster by cluster"""
+        # Cluster near-duplicate headlines as items arrive: LSH band buckets propose pairs, signature agreement confirms
+        items, signatures, parent, buckets = [], [], [], defaultdict(list)
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for i, item in enumerate(news_items):
+            signature = _headline_signature(item['headline'])
+            items.append(item)
+            signatures.append(signature)
+            parent.append(i)
+            candidates = set()
+            for band in range(LSH_BANDS):
+                bucket = buckets[band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()]
+                candidates.update(bucket)
+                bucket.append(i)
+            for j in candidates:
+                if np.mean(signatures[j] == signature) >= self.corroboration_threshold:
+                    parent[find(i)] = find(j)
+        
+        headline_groups = defaultdict(list)
+        for i, item in enumerate(items):
+            headline_groups[find(i)].append(item)
         
         for group in headline_groups.values():
-            low_trust_items = [item for item in group if item['requires_corroboration']]
-            other_items = [item for item in group if not item['requires_corroboration']]
+            low_trust_items, other_items = [], []
+            for item in group:
+                (low_trust_items if item['requires_corroboration'] else other_items).append(item)
             
             # If low-trust items have corroboration from other sources
             for low_trust_item in low_trust_items:
                 if len(other_items) >= 1:  # At least 1 independent source
                     low_trust_item['corroborated'] = True
-                    corroborated_items.append(low_trust_item)
                 else:
                     low_trust_item['corroborated'] = False
                     low_trust_item['status'] = 'MUTED'
-                    corroborated_items.append(low_trust_item)
+                yield low_trust_item
             
             # Add all other items
-            corroborated_items.extend(other_items)
-        
-        return corroborated_items
+            yield from other_items
+    
+    async def _fetch_news(self, domain, category, host_semaphores):
+        """Fetch one source, holding that host's semaphore for the request plus the politeness delay"""
+        async with host_semaphores.setdefault(domain, asyncio.Semaphore(1)):
+            async with self.concurrency.acquire():
+                print(f"Fetching from {domain} (category: {category})")
+                
+                # Simulate fetch (replace with actual implementation); blocking fetchers run off the event loop
+                items = await asyncio.to_thread(list, self._simulate_news_fetch(domain, category))
+                self.concurrency.report_success()
+            
+            await asyncio.sleep(self.request_delay)  # Rate limiting
+            return domain, items
+    
+    async def _fetch_all_sources(self):
+        """Fetch every allowed source concurrently; results come back in source order"""
+        host_semaphores = {}
+        coros = [
+            self._fetch_news(domain, category, host_semaphores)
+            for category, config in self.source_weights.items()
+            if isinstance(config, dict) and 'sources' in config and config['weight'] > 0
+            for domain in config['sources']
+            if self._is_domain_allowed(f"https://{domain}")
+        ]
+        return await asyncio.gather(*coros)
     
     def ingest_daily_news(self, target_date=None):
         """Main ingestion pipeline for daily news"""
@@ -219,25 +328,12 @@ class NewsIngestionEngine:
         
         print(f"Starting news ingestion for {target_date}...")
         
-        all_news_items = []
-        sources_used = set()
+        # Fetch from every source category concurrently (sync wrapper around the async fetch)
+        fetched = asyncio.run(self._fetch_all_sources())
+        sources_used = {domain for domain, _ in fetched}
         
-        # Simulate fetching from different source categories
-        for category, config in self.source_weights.items():
-            if isinstance(config, dict) and 'sources' in config and config['weight'] > 0:
-                for domain in config['sources']:
-                    if self._is_domain_allowed(f"https://{domain}"):
-                        print(f"Fetching from {domain} (category: {category})")
-                        
-                        # Simulate fetch (replace with actual implementation)
-                        items = self._simulate_news_fetch(domain, category)
-                        all_news_items.extend(items)
-                        sources_used.add(domain)
-                        
-                        time.sleep(self.request_delay)  # Rate limiting
-        
-        # Check corroboration for low-trust sources
-        all_news_items = self._check_corroboration(all_news_items)
+        # Check corroboration for low-trust sources (streams the fetched batches; one list at the end)
+        all_news_items = list(self._check_corroboration(item for _, items in fetched for item in items))
         
         # Fetch macro events
         macro_events = self._simulate_macro_data()
@@ -264,88 +360,88 @@ class NewsIngestionEngine:
         
         artifacts = {}
         
+        # Columnar view of the news items, shared by the feed log and its Parquet snapshot
+        news_df = pd.DataFrame(ingestion_result['news_items'], columns=NEWS_ITEM_COLUMNS)
+        
         # Write NEWS_FEED_LOG.md
-        news_log = self._write_news_feed_log(ingestion_result['news_items'], audit_dir)
+        news_log = self._write_news_feed_log(news_df, audit_dir)
         artifacts['news_feed_log'] = news_log
         
+        # Write NEWS_FEED_LOG.parquet for cheap re-aggregation
+        if PARQUET_AVAILABLE:
+            news_table = audit_dir / 'NEWS_FEED_LOG.parquet'
+            news_df.to_parquet(news_table, index=False)
+            artifacts['news_feed_table'] = str(news_table)
+        
         # Write MACRO_EVENTS.md
         macro_log = self._write_macro_events_log(ingestion_result['macro_events'], audit_dir)
         artifacts['macro_events_log'] = macro_log
         
         return artifacts
     
-    def _write_news_feed_log(self, news_items, audit_dir):
+    def _write_news_feed_log(self, news_df, audit_dir):
         """Write NEWS_FEED_LOG.md"""
         log_file = audit_dir / 'NEWS_FEED_LOG.md'
         
-        content = f"""# News Feed Log
+        now = datetime.now()
+        now_date = now.date().isoformat()
+        now_ts = now.strftime('%Y-%m-%d %H:%M:%S UTC')
+        
+        # Column-wise status labels and weight categories (one weight lookup per source, not per item)
+        muted = news_df['status'].eq('MUTED')
+        status_text = np.select(
+            [muted, news_df['corroborated'].eq(False), news_df['corroborated'].eq(True)],
+            [" ⚠️ MUTED (No corroboration)", " ❌ UNCORROBORATED", " ✅ CORROBORATED"],
+            default=""
+        )
+        source_weights = {source: self._get_source_weight(source) for source in news_df['source'].unique()}
+        weight_category = news_df['source'].map(lambda source: source_weights[source][1])
+        
+        with open(log_file, 'w', encoding='utf-8') as f:
+            f.write(f"""# News Feed Log
 
-**Date**: {datetime.now().date()}
-**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-**Items Processed**: {len(news_items)}
+**Date**: {now_date}
+**Generated**: {now_ts}
+**Items Processed**: {len(news_df)}
 
 ## News Items by Source
 
-"""
-        
-        # Group by source
-        by_source = {}
-        for item in news_items:
-            source = item['source']
-            if source not in by_source:
-                by_source[source] = []
-            by_source[source].append(item)
-        
-        for source, items in sorted(by_source.items()):
-            weight, category = self._get_source_weight(source)
-            content += f"### {source} (Category: {category}, Weight: {weight})\n\n"
+""")
             
-            for item in items:
-                status = ""
-                if item.get('status') == 'MUTED':
-                    status = " ⚠️ MUTED (No corroboration)"
-                elif item.get('corroborated') is False:
-                    status = " ❌ UNCORROBORATED"
-                elif item.get('corroborated') is True:
-                    status = " ✅ CORROBORATED"
+            # Group by source
+            for source, group in news_df.assign(status_text=status_text).groupby('source', sort=True):
+                weight, category = source_weights[source]
+                f.write(f"### {source} (Category: {category}, Weight: {weight})\n\n")
                 
-                content += f"- **{item['severity']}**: {item['headline']}{status}\n"
-                content += f"  - Time: {item['timestamp'].strftime('%H:%M:%S')}\n"
-                content += f"  - Link: {item['link']}\n\n"
-        
-        # Summary statistics
-        content += f"""## Summary
+                for severity, headline, status, time_str, link in zip(
+                        group['severity'], group['headline'], group['status_text'], group['time_str'], group['link']):
+                    f.write(f"- **{severity}**: {headline}{status}\n"
+                            f"  - Time: {time_str}\n"
+                            f"  - Link: {link}\n\n")
+            
+            # Summary statistics
+            f.write(f"""## Summary
 
 ### By Category
-"""
-        category_counts = {}
-        muted_counts = {}
-        
-        for item in news_items:
-            weight, category = self._get_source_weight(item['source'])
-            category_counts[category] = category_counts.get(category, 0) + 1
-            if item.get('status') == 'MUTED':
-                muted_counts[category] = muted_counts.get(category, 0) + 1
-        
-        for category, count in sorted(category_counts.items()):
-            muted = muted_counts.get(category, 0)
-            content += f"- **{category}**: {count} items"
-            if muted > 0:
-                content += f" ({muted} muted)"
-            content += f"\n"
-        
-        content += f"""
+""")
+            category_counts = weight_category.value_counts()
+            muted_counts = weight_category[muted].value_counts()
+            for category, count in sorted(category_counts.items()):
+                muted_count = muted_counts.get(category, 0)
+                f.write(f"- **{category}**: {count} items")
+                if muted_count > 0:
+                    f.write(f" ({muted_count} muted)")
+                f.write(f"\n")
+            
+            f.write(f"""
 ### Quality Control
-- Items requiring corroboration: {len([item for item in news_items if item.get('requires_corroboration')])}
-- Muted items (uncorroborated): {len([item for item in news_items if item.get('status') == 'MUTED'])}
-- Total sources used: {len(set(item['source'] for item in news_items))}
+- Items requiring corroboration: {news_df['requires_corroboration'].eq(True).sum()}
+- Muted items (uncorroborated): {muted.sum()}
+- Total sources used: {news_df['source'].nunique()}
 
 ---
 Generated by News Ingestion Engine v0.1
-"""
-        
-        with open(log_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+""")
         
         return str(log_file)
     
@@ -353,60 +449,64 @@ Generated by News Ingestion Engine v0.1
         """Write MACRO_EVENTS.md"""
         log_file = audit_dir / 'MACRO_EVENTS.md'
         
-        content = f"""# Macro Events Log
+        now = datetime.now()
+        now_date = now.date().isoformat()
+        now_ts = now.strftime('%Y-%m-%d %H:%M:%S UTC')
+        
+        parts = [f"""# Macro Events Log
 
-**Date**: {datetime.now().date()}
-**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+**Date**: {now_date}
+**Generated**: {now_ts}
 **Events Processed**: {len(macro_events)}
 
 ## Economic Calendar Events
 
-"""
+"""]
         
         for event in macro_events:
-            content += f"### {event['event']} ({event['time']})\n\n"
-            content += f"- **Severity**: {event['severity']}\n"
+            parts.append(f"### {event['event']} ({event['time']})\n\n")
+            parts.append(f"- **Severity**: {event['severity']}\n")
             
             if 'consensus' in event and event['consensus']:
-                content += f"- **Consensus**: {event['consensus']}\n"
+                parts.append(f"- **Consensus**: {event['consensus']}\n")
             if 'actual' in event and event['actual']:
-                content += f"- **Actual**: {event['actual']}\n"
+                parts.append(f"- **Actual**: {event['actual']}\n")
             if 'prior' in event and event['prior']:
-                content += f"- **Prior**: {event['prior']}\n"
+                parts.append(f"- **Prior**: {event['prior']}\n")
             
             if 'z_score' in event:
                 surprise_text = "📈 Positive" if event['z_score'] > 0 else "📉 Negative" if event['z_score'] < 0 else "➖ Neutral"
-                content += f"- **Surprise**: {surprise_text} (z={event['z_score']:.2f})\n"
-                content += f"- **Market Impact**: {'Significant' if abs(event['z_score']) >= 1.0 else 'Moderate'}\n"
+                parts.append(f"- **Surprise**: {surprise_text} (z={event['z_score']:.2f})\n")
+                parts.append(f"- **Market Impact**: {'Significant' if abs(event['z_score']) >= 1.0 else 'Moderate'}\n")
             
-            content += f"- **Source**: {event['source']}\n\n"
+            parts.append(f"- **Source**: {event['source']}\n\n")
         
-        content += f"""## Summary
+        parts.append(f"""## Summary
 
 ### Surprise Analysis
-"""
+""")
         
         high_surprises = [e for e in macro_events if e.get('z_score') and abs(e['z_score']) >= 1.0]
         positive_surprises = [e for e in macro_events if e.get('z_score') and e['z_score'] > 0]
         negative_surprises = [e for e in macro_events if e.get('z_score') and e['z_score'] < 0]
         
-        content += f"- **High Impact Events** (|z| >= 1.0): {len(high_surprises)}\n"
-        content += f"- **Positive Surprises**: {len(positive_surprises)}\n"
-        content += f"- **Negative Surprises**: {len(negative_surprises)}\n"
+        parts.append(f"- **High Impact Events** (|z| >= 1.0): {len(high_surprises)}\n")
+        parts.append(f"- **Positive Surprises**: {len(positive_surprises)}\n")
+        parts.append(f"- **Negative Surprises**: {len(negative_surprises)}\n")
         
         if high_surprises:
-            content += f"\n### High Impact Events Detail\n"
+            parts.append(f"\n### High Impact Events Detail\n")
             for event in high_surprises:
-                content += f"- {event['event']}: z={event['z_score']:.2f} ({event['surprise_direction']})\n"
+                parts.append(f"- {event['event']}: z={event['z_score']:.2f} ({event['surprise_direction']})\n")
         
-        content += f"""
+        parts.append(f"""
 
 ---
 Generated by News Ingestion Engine v0.1
-"""
+""")
         
         with open(log_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write(''.join(parts))
         
         return str(log_file)
 
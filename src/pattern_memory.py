@@ -7,9 +7,21 @@ Tracks recurring patterns in forecast performance
 import pandas as pd
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Month keys are ints and pattern values may be numpy scalars
+ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+                  if ORJSON_AVAILABLE else 0)
+
 class PatternMemory:
     def __init__(self):
         self.patterns = {}
@@ -18,30 +30,50 @@ class PatternMemory:
     def identify_patterns(self, forecast_df: pd.DataFrame, miss_df: pd.DataFrame) -> Dict:
         """Identify recurring patterns in forecasts and misses"""
         
-        patterns = {
-            'accuracy_patterns': self._find_accuracy_patterns(forecast_df),
-            'miss_patterns': self._find_miss_patterns(miss_df),
-            'confidence_patterns': self._find_confidence_patterns(forecast_df),
-            'temporal_patterns': self._find_temporal_patterns(forecast_df)
-        }
+        # Derived columns and one (weekday, month, bucket) aggregation shared by the forecast pattern helpers
+        if forecast_df.empty:
+            df, accuracy_agg = forecast_df, None
+        else:
+            df = forecast_df.assign(
+                weekday=forecast_df['FORECAST_DATE'].dt.day_name(),
+                month=forecast_df['FORECAST_DATE'].dt.month,
+                confidence_bucket=pd.cut(forecast_df['CONFIDENCE'],
+                                         bins=[0, 0.7, 0.8, 0.9, 1.0],
+                                         labels=['Low', 'Med', 'High', 'Very High'])
+            )
+            accuracy_agg = df.groupby(['weekday', 'month', 'confidence_bucket'],
+                                      observed=True, dropna=False)['ACCURACY'].agg(['sum', 'count'])
+        
+        # Independent passes; pandas releases the GIL in its groupby/reduction kernels
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'accuracy_patterns': executor.submit(self._find_accuracy_patterns, accuracy_agg),
+                'miss_patterns': executor.submit(self._find_miss_patterns, miss_df),
+                'confidence_patterns': executor.submit(self._find_confidence_patterns, df),
+                'temporal_patterns': executor.submit(self._find_temporal_patterns, accuracy_agg)
+            }
+            patterns = {name: future.result() for name, future in futures.items()}
         
         return patterns
     
-    def _find_accuracy_patterns(self, df: pd.DataFrame) -> Dict:
+    @staticmethod
+    def _marginal_accuracy(accuracy_agg: pd.DataFrame, level: str) -> Dict:
+        """Mean accuracy per value of one aggregation level (sum/count, not mean of means)"""
+        
+        totals = accuracy_agg.groupby(level=level, observed=True).sum()
+        return (totals['sum'] / totals['count']).to_dict()
+    
+    def _find_accuracy_patterns(self, accuracy_agg: pd.DataFrame) -> Dict:
         """Find patterns in accuracy over time"""
         
-        if df.empty:
+        if accuracy_agg is None:
             return {}
         
         # Weekly accuracy patterns
-        df['weekday'] = df['FORECAST_DATE'].dt.day_name()
-        weekday_accuracy = df.groupby('weekday')['ACCURACY'].mean().to_dict()
+        weekday_accuracy = self._marginal_accuracy(accuracy_agg, 'weekday')
         
         # Confidence level accuracy
-        df['confidence_bucket'] = pd.cut(df['CONFIDENCE'], 
-                                       bins=[0, 0.7, 0.8, 0.9, 1.0], 
-                                       labels=['Low', 'Med', 'High', 'Very High'])
-        confidence_accuracy = df.groupby('confidence_bucket')['ACCURACY'].mean().to_dict()
+        confidence_accuracy = self._marginal_accuracy(accuracy_agg, 'confidence_bucket')
         
         return {
             'weekday_performance': weekday_accuracy,
@@ -73,23 +105,22 @@ class PatternMemory:
             return {}
         
         # Overconfidence detection
-        high_conf_misses = df[(df['CONFIDENCE'] > 0.85) & (df['ACCURACY'] == 0)]
-        overconfidence_rate = len(high_conf_misses) / len(df[df['CONFIDENCE'] > 0.85]) if len(df[df['CONFIDENCE'] > 0.85]) > 0 else 0
+        high_conf_accuracy = df['ACCURACY'][df['CONFIDENCE'] > 0.85]
+        overconfidence_rate = int((high_conf_accuracy == 0).sum()) / len(high_conf_accuracy) if len(high_conf_accuracy) > 0 else 0
         
         return {
             'overconfidence_rate': overconfidence_rate,
-            'high_confidence_accuracy': df[df['CONFIDENCE'] > 0.85]['ACCURACY'].mean()
+            'high_confidence_accuracy': high_conf_accuracy.mean()
         }
     
-    def _find_temporal_patterns(self, df: pd.DataFrame) -> Dict:
+    def _find_temporal_patterns(self, accuracy_agg: pd.DataFrame) -> Dict:
         """Find time-based patterns"""
         
-        if df.empty:
+        if accuracy_agg is None:
             return {}
         
         # Month-over-month trends
-        df['month'] = df['FORECAST_DATE'].dt.month
-        monthly_accuracy = df.groupby('month')['ACCURACY'].mean().to_dict()
+        monthly_accuracy = self._marginal_accuracy(accuracy_agg, 'month')
         
         return {
             'monthly_performance': monthly_accuracy
@@ -104,8 +135,11 @@ class PatternMemory:
         patterns['analysis_date'] = datetime.now().isoformat()
         patterns['version'] = '1.0'
         
-        with open(self.pattern_file, 'w') as f:
-            json.dump(patterns, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            Path(self.pattern_file).write_bytes(orjson.dumps(patterns, default=str, option=ORJSON_OPTIONS))
+        else:
+            with open(self.pattern_file, 'w') as f:
+                json.dump(patterns, f, indent=2, default=str)
         
         print(f"Patterns saved to {self.pattern_file}")
     
@@ -113,6 +147,8 @@ class PatternMemory:
         """Load previously saved patterns"""
         
         if os.path.exists(self.pattern_file):
+            if ORJSON_AVAILABLE:
+                return orjson.loads(Path(self.pattern_file).read_bytes())
             with open(self.pattern_file, 'r') as f:
                 return json.load(f)
         return {}
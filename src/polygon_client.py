@@ -1,8 +1,35 @@
 import os
+import sys
+import time
+import asyncio
+import importlib.util
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# httpx only multiplexes over HTTP/2 when the h2 package is installed
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent))
+
+from adaptive_concurrency import AdaptiveConcurrencyManager
+
+# Shared across clients: batch callers acquire slots, every response reports back
+concurrency = AdaptiveConcurrencyManager()
+
+TIMEOUT = float(os.getenv("POLYGON_TIMEOUT", "30"))
 
 
 class PolygonClient:
@@ -14,6 +41,30 @@ class PolygonClient:
         if not self.api_key:
             raise ValueError("Polygon API key not set. Please set POLYGON_API_KEY env var.")
 
+        # Keep-alive session: one TCP/TLS handshake per pooled connection instead of per call.
+        # Transport retries cover 5xx only; 429s are left to get() so the adaptive limit sees them.
+        self.session = requests.Session()
+        retries = Retry(
+            total=3,
+            status_forcelist=[500, 502, 503, 504],
+            backoff_factor=0.5,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def get(self, endpoint: str, params: dict | None = None) -> dict:
         """Perform a GET request to a Polygon endpoint with rate limiting."""
         if params is None:
@@ -25,33 +76,37 @@ class PolygonClient:
         # Import rate limiter if available
         try:
             from stage7.rate_limiter import rate_limiter
-            max_retries = 3
-            
-            for attempt in range(max_retries):
-                # Apply rate limiting
+        except ImportError:
+            rate_limiter = None
+        
+        max_retries = 3
+        for attempt in range(max_retries):
+            # Apply rate limiting
+            if rate_limiter is not None:
                 rate_limiter.wait_if_needed()
-                
-                response = requests.get(url, params=params)
-                
-                if response.status_code == 429:
-                    # Handle rate limiting
-                    retry_after = response.headers.get('Retry-After')
-                    if attempt < max_retries - 1:
-                        rate_limiter.handle_429(retry_after)
-                        continue
-                    else:
-                        # Max retries exceeded
-                        raise requests.HTTPError(
-                            f"429 Too Many Requests after {max_retries} attempts for {url}\nDetails: {response.text}"
-                        )
-                        
+            
+            response = self.session.get(url, params=params, timeout=TIMEOUT)
+            
+            if response.status_code != 429:
                 # Success or non-429 error
-                rate_limiter.reset_retry_count()
+                if rate_limiter is not None:
+                    rate_limiter.reset_retry_count()
+                if response.ok:
+                    concurrency.report_success()
                 break
-                
-        except ImportError:
-            # Rate limiter not available, use original logic
-            response = requests.get(url, params=params)
+            
+            # Handle rate limiting: shrink shared concurrency, then back off and retry
+            retry_after = response.headers.get('Retry-After')
+            backoff = concurrency.report_rate_limit(retry_after)
+            if attempt == max_retries - 1:
+                # Max retries exceeded
+                raise requests.HTTPError(
+                    f"429 Too Many Requests after {max_retries} attempts for {url}\nDetails: {response.text}"
+                )
+            if rate_limiter is not None:
+                rate_limiter.handle_429(retry_after)
+            else:
+                time.sleep(backoff)
 
         try:
             response.raise_for_status()
@@ -63,6 +118,81 @@ class PolygonClient:
 
         return response.json()
 
+    async def _aget(self, client, endpoint: str, params: dict | None, rate_limiter) -> dict:
+        """Async GET over a shared httpx client, with the same 429 handling as get()."""
+        params = dict(params or {})
+        params["apiKey"] = self.api_key
+        url = f"{self.base_url}{endpoint}"
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            if rate_limiter is not None:
+                await asyncio.to_thread(rate_limiter.wait_if_needed)
+
+            async with concurrency.acquire():
+                response = await client.get(endpoint, params=params)
+
+            if response.status_code != 429:
+                if rate_limiter is not None:
+                    rate_limiter.reset_retry_count()
+                if response.is_success:
+                    concurrency.report_success()
+                break
+
+            backoff = concurrency.report_rate_limit(response.headers.get('Retry-After'))
+            if attempt == max_retries - 1:
+                raise requests.HTTPError(
+                    f"429 Too Many Requests after {max_retries} attempts for {url}\nDetails: {response.text}"
+                )
+            await asyncio.sleep(backoff)
+
+        if response.is_error:
+            raise requests.HTTPError(
+                f"{response.status_code} {response.reason_phrase} for {url}\nDetails: {response.text}"
+            )
+
+        return response.json()
+
+    async def _aget_many(self, calls: list[tuple[str, dict | None]]) -> list:
+        """Gather all GETs over one (HTTP/2 when available) connection pool; failures are returned in place."""
+        try:
+            from stage7.rate_limiter import rate_limiter
+        except ImportError:
+            rate_limiter = None
+
+        # Pool limits and HTTP/2 belong to the transport once a custom one (for connect retries) is passed
+        transport = httpx.AsyncHTTPTransport(http2=H2_AVAILABLE, limits=httpx.Limits(max_connections=16), retries=3)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=TIMEOUT, transport=transport) as client:
+            return await asyncio.gather(
+                *(self._aget(client, endpoint, params, rate_limiter) for endpoint, params in calls),
+                return_exceptions=True,
+            )
+
+    def get_many(self, calls: list[tuple[str, dict | None]]) -> list:
+        """GET several (endpoint, params) pairs concurrently.
+
+        Returns one entry per request, in request order: the parsed JSON, or the
+        exception that request raised (one failure does not abort the batch).
+        """
+        calls = list(calls)
+        if HTTPX_AVAILABLE:
+            # Sync facade over the async batch (not callable from inside a running event loop)
+            return asyncio.run(self._aget_many(calls))
+
+        # Width follows the adaptive level, so a batch shrinks after 429s like single calls do
+        with ThreadPoolExecutor(max_workers=max(1, concurrency.current_level)) as executor:
+            futures = [executor.submit(self.get, endpoint, dict(params or {})) for endpoint, params in calls]
+            return [future.exception() or future.result() for future in futures]
+
+
+@lru_cache(maxsize=None)
+def get_client() -> PolygonClient:
+    """Shared client built on first use, so importing this module needs no API key."""
+    return PolygonClient()
+
 
-# Pre-configured singleton instance for convenience
-client = PolygonClient()
+def __getattr__(name):
+    # Keeps `from polygon_client import client` working without building it at import time
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,8 @@
-import requests
 from datetime import date, timedelta
 
+from polygon_client import PolygonClient
+
 API_KEY = "jYeR6QVhnmhFe7V0aQm1_ZuGM6QawAEO"
-base_url = "https://api.polygon.io/v2/aggs/ticker"
 
 # Symbols to test
 symbols = ["SPY", "VIX", "VVIX"]
@@ -10,14 +10,18 @@ symbols = ["SPY", "VIX", "VVIX"]
 # Yesterday’s date
 yesterday = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
 
-for symbol in symbols:
-    url = f"{base_url}/{symbol}/range/1/day/{yesterday}/{yesterday}?adjusted=true&sort=asc&limit=1&apiKey={API_KEY}"
-    print(f"Requesting {symbol}...")
-    resp = requests.get(url)
-    print(f"Status {resp.status_code}")
-    try:
-        data = resp.json()
-        print(data)
-    except Exception as e:
-        print("Error parsing JSON:", e)
+# One concurrent batch instead of a request per symbol in turn
+params = {"adjusted": "true", "sort": "asc", "limit": 1}
+calls = [(f"/v2/aggs/ticker/{symbol}/range/1/day/{yesterday}/{yesterday}", params) for symbol in symbols]
+print(f"Requesting {', '.join(symbols)}...")
+with PolygonClient(api_key=API_KEY) as polygon:
+    results = polygon.get_many(calls)
+
+# Each symbol reports on its own, so one failed request doesn't hide the others
+for symbol, result in zip(symbols, results):
+    print(f"{symbol}:")
+    if isinstance(result, Exception):
+        print("Error fetching data:", result)
+    else:
+        print(result)
     print("-" * 50)
@@ -7,95 +7,24 @@ Enforces mute policy and prevents range classification until trust is earned bac
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
+from collections import ChainMap
 
 
-class RangeGuardEnforcer:
-    """Range Guard enforcement and policy system"""
-    
-    def __init__(self):
-        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.audit_dir = Path('audit_exports') / 'daily' / self.timestamp
-        self.audit_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Current diagnostics (confirmed)
-        self.current_diagnostics = {
-            'usage_rate': 0.75,
-            'precision': 0.20,
-            'recall': 1.00,
-            'f1_score': 0.33,
-            'delta_accuracy': -0.08
-        }
-        
-        # Unmute thresholds
-        self.unmute_thresholds = {
-            'f1_min': 0.65,
-            'delta_acc_min': 0.02,
-            'usage_max': 0.50,
-            'min_cohort_days': 5
-        }
-    
-    def mr1_enforce_mute_policy(self):
-        """MR 1: Enforce the mute policy and review gate"""
-        
-        # Check current performance against unmute criteria
-        mute_assessment = self.assess_mute_status()
-        
-        # Update mute decision with next review date
-        mute_decision = self.update_range_mute_decision()
-        
-        # Create policy enforcement artifact
-        policy_enforcement = self.create_policy_enforcement()
-        
-        # Update daily headline metric to Binary
-        headline_update = self.update_headline_metric()
-        
-        return {
-            'mute_assessment': mute_assessment,
-            'mute_decision': mute_decision,
-            'policy_enforcement': policy_enforcement,
-            'headline_update': headline_update
-        }
-    
-    def assess_mute_status(self):
-        """Assess current performance against unmute thresholds"""
-        
-        criteria_met = {
-            'f1_score': self.current_diagnostics['f1_score'] >= self.unmute_thresholds['f1_min'],
-            'delta_accuracy': self.current_diagnostics['delta_accuracy'] >= self.unmute_thresholds['delta_acc_min'],
-            'usage_rate': self.current_diagnostics['usage_rate'] <= self.unmute_thresholds['usage_max'],
-            'cohort_size': False  # Not enough new cohort days yet
-        }
-        
-        all_criteria_met = all(criteria_met.values())
-        
-        assessment = {
-            'mute_status': 'ENFORCED',
-            'criteria_met': criteria_met,
-            'all_criteria_met': all_criteria_met,
-            'blocking_factors': [k for k, v in criteria_met.items() if not v]
-        }
-        
-        return assessment
-    
-    def update_range_mute_decision(self):
-        """Update RANGE_MUTE_DECISION.md with policy enforcement"""
-        
-        next_review_date = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-        
-        mute_content = f"""# Range Mute Decision (ENFORCED)
+# Artifact bodies, rendered with str.format_map (metrics come from the enforcer's dicts)
+_MUTE_TEMPLATE = """# Range Mute Decision (ENFORCED)
 
-**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+**Generated**: {now}
 **Status**: MUTED (Policy Enforced)
-**Next Review**: {next_review_date}
+**Next Review**: {next_review}
 
 ## Current Performance (Confirmed Diagnostics)
 
 | Metric | Current | Threshold | Status |
 |--------|---------|-----------|--------|
-| **F1 Score** | {self.current_diagnostics['f1_score']:.3f} | >= {self.unmute_thresholds['f1_min']:.2f} | FAIL |
-| **Delta Accuracy** | {self.current_diagnostics['delta_accuracy']*100:+.1f}pp | >= +{self.unmute_thresholds['delta_acc_min']*100:.0f}pp | FAIL |
-| **Usage Rate** | {self.current_diagnostics['usage_rate']*100:.0f}% | <= {self.unmute_thresholds['usage_max']*100:.0f}% | FAIL |
-| **Fresh Cohort** | 0 days | >= {self.unmute_thresholds['min_cohort_days']} days | PENDING |
+| **F1 Score** | {f1_score:.3f} | >= {f1_min:.2f} | FAIL |
+| **Delta Accuracy** | {delta_pp:+.1f}pp | >= +{delta_acc_min_pp:.0f}pp | FAIL |
+| **Usage Rate** | {usage_pct:.0f}% | <= {usage_max_pct:.0f}% | FAIL |
+| **Fresh Cohort** | 0 days | >= {min_cohort_days} days | PENDING |
 
 ## Mute Reason (Kid Words)
 
@@ -131,7 +60,7 @@ Stay muted until we prove we can do better on fresh data.
 
 ## Review Schedule
 
-### Next Review: {next_review_date}
+### Next Review: {next_review}
 **Criteria Check**: Assess all 4 unmute conditions
 **If Still Blocked**: Extend mute by 1 week, continue improvement work
 **If Unblocked**: Begin candidate shadow testing
@@ -162,19 +91,10 @@ Stay muted until we prove we can do better on fresh data.
 **MUTE STATUS**: ENFORCED until all criteria pass on fresh cohort
 Generated by Range Guard Enforcer v1.0
 """
-        
-        mute_file = self.audit_dir / 'RANGE_MUTE_DECISION.md'
-        with open(mute_file, 'w', encoding='utf-8') as f:
-            f.write(mute_content)
-        
-        return str(mute_file)
-    
-    def create_policy_enforcement(self):
-        """Create policy enforcement artifact"""
-        
-        policy_content = f"""# Range Guard Policy Enforcement
 
-**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+_POLICY_TEMPLATE = """# Range Guard Policy Enforcement
+
+**Generated**: {now}
 **Enforcement Status**: ACTIVE
 **Policy**: Range Guard Truth Pass
 
@@ -248,10 +168,105 @@ All range-related features disabled until trust earned back:
 **POLICY STATUS**: Range Guard mute enforced until trust earned back
 Generated by Range Guard Enforcer v1.0
 """
+
+
+class RangeGuardEnforcer:
+    """Range Guard enforcement and policy system"""
+    
+    def __init__(self):
+        # One clock read per run: filenames and every artifact share the same time
+        self._now = datetime.now()
+        self._now_str = self._now.strftime('%Y-%m-%d %H:%M:%S UTC')
+        self.timestamp = self._now.strftime('%Y%m%d_%H%M%S')
+        self.next_review_date = (self._now + timedelta(days=7)).strftime('%Y-%m-%d')
+        self.audit_dir = Path('audit_exports') / 'daily' / self.timestamp
+        self.audit_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Current diagnostics (confirmed)
+        self.current_diagnostics = {
+            'usage_rate': 0.75,
+            'precision': 0.20,
+            'recall': 1.00,
+            'f1_score': 0.33,
+            'delta_accuracy': -0.08
+        }
+        
+        # Unmute thresholds
+        self.unmute_thresholds = {
+            'f1_min': 0.65,
+            'delta_acc_min': 0.02,
+            'usage_max': 0.50,
+            'min_cohort_days': 5
+        }
+    
+    def mr1_enforce_mute_policy(self):
+        """MR 1: Enforce the mute policy and review gate"""
+        
+        # Check current performance against unmute criteria
+        mute_assessment = self.assess_mute_status()
+        
+        # Update mute decision with next review date
+        mute_decision = self.update_range_mute_decision()
+        
+        # Create policy enforcement artifact
+        policy_enforcement = self.create_policy_enforcement()
+        
+        # Update daily headline metric to Binary
+        headline_update = self.update_headline_metric()
+        
+        return {
+            'mute_assessment': mute_assessment,
+            'mute_decision': mute_decision,
+            'policy_enforcement': policy_enforcement,
+            'headline_update': headline_update
+        }
+    
+    def assess_mute_status(self):
+        """Assess current performance against unmute thresholds"""
+        
+        criteria_met = {
+            'f1_score': self.current_diagnostics['f1_score'] >= self.unmute_thresholds['f1_min'],
+            'delta_accuracy': self.current_diagnostics['delta_accuracy'] >= self.unmute_thresholds['delta_acc_min'],
+            'usage_rate': self.current_diagnostics['usage_rate'] <= self.unmute_thresholds['usage_max'],
+            'cohort_size': False  # Not enough new cohort days yet
+        }
+        
+        all_criteria_met = all(criteria_met.values())
+        
+        assessment = {
+            'mute_status': 'ENFORCED',
+            'criteria_met': criteria_met,
+            'all_criteria_met': all_criteria_met,
+            'blocking_factors': [k for k, v in criteria_met.items() if not v]
+        }
+        
+        return assessment
+    
+    def update_range_mute_decision(self):
+        """Update RANGE_MUTE_DECISION.md with policy enforcement"""
+        
+        extras = {
+            'now': self._now_str,
+            'next_review': self.next_review_date,
+            'delta_pp': self.current_diagnostics['delta_accuracy'] * 100,
+            'delta_acc_min_pp': self.unmute_thresholds['delta_acc_min'] * 100,
+            'usage_pct': self.current_diagnostics['usage_rate'] * 100,
+            'usage_max_pct': self.unmute_thresholds['usage_max'] * 100
+        }
+        mute_content = _MUTE_TEMPLATE.format_map(ChainMap(extras, self.current_diagnostics, self.unmute_thresholds))
+        
+        mute_file = self.audit_dir / 'RANGE_MUTE_DECISION.md'
+        mute_file.write_text(mute_content, encoding='utf-8')
+        
+        return str(mute_file)
+    
+    def create_policy_enforcement(self):
+        """Create policy enforcement artifact"""
+        
+        policy_content = _POLICY_TEMPLATE.format_map({'now': self._now_str})
         
         policy_file = self.audit_dir / 'RANGE_GUARD_POLICY.md'
-        with open(policy_file, 'w', encoding='utf-8') as f:
-            f.write(policy_content)
+        policy_file.write_text(policy_content, encoding='utf-8')
         
         return str(policy_file)
     
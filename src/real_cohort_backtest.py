@@ -14,6 +14,18 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+def _binary_metrics(y_true, y_pred):
+    """Confusion matrix, precision, recall and F1 for 0/1 labels from one bincount over 2*true + pred"""
+    cm = np.bincount(2 * np.asarray(y_true, dtype=np.int64) + np.asarray(y_pred, dtype=np.int64),
+                     minlength=4).reshape(2, 2)  # [[TN, FP], [FN, TP]]
+    (tn, fp), (fn, tp) = cm.tolist()
+    
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+    return cm, precision, recall, f1
+
+
 class RealCohortBacktest:
     """Real market data backtest for ChopGuard v0.2 validation"""
     
@@ -48,79 +60,80 @@ class RealCohortBacktest:
         # Market symbols (Yahoo Finance compatible)
         symbols = ['^GSPC', 'ES=F', '^VIX']
         
-        data = []
-        np.random.seed(123)  # Different seed for "real" data
-        
-        for date in trading_days:
-            for symbol in symbols:
-                # Realistic S&P 500 levels around 4200-4400
-                if symbol == '^GSPC':
-                    base_price = 4300 + np.random.normal(0, 30)
-                elif symbol == 'ES=F':
-                    base_price = 4295 + np.random.normal(0, 25) 
-                else:  # VIX
-                    base_price = 18 + np.random.exponential(3)
-                    
-                # OHLC with realistic intraday movement
-                open_price = base_price + np.random.normal(0, 5)
-                high_price = open_price + np.random.exponential(15)
-                low_price = open_price - np.random.exponential(12)
-                close_price = open_price + np.random.normal(0, 8)
-                volume = np.random.lognormal(15.5, 0.8)
-                
-                # Features for CHOP detection
-                true_range = max(high_price - low_price,
-                               abs(high_price - close_price),
-                               abs(low_price - close_price))
-                
-                atm_straddle = 0.018 * close_price  # Realistic ATM straddle
-                normalized_tr = true_range / atm_straddle
-                
-                overnight_gap = abs(open_price - close_price) / close_price
-                overnight_gap_flag = 1 if overnight_gap > 0.004 else 0
-                
-                day_of_week = date.weekday()
-                
-                # Ground truth based on realistic market patterns
-                # CHOP more likely: low normalized TR, Tuesday/Wednesday, low VIX
-                vix_factor = 0.20 if symbol == '^VIX' and base_price < 22 else 0
-                day_factor = 0.15 if day_of_week in [1, 2] else 0  # Tue/Wed
-                vol_factor = -0.05 * max(0, normalized_tr - 1.0)
-                
-                chop_prob = 0.35 + vix_factor + day_factor + vol_factor
-                chop_prob = np.clip(chop_prob, 0.1, 0.9)
-                
-                is_chop = np.random.binomial(1, chop_prob)
-                binary_up = np.random.binomial(1, 0.53)  # Slight bull bias
-                
-                # Range proxy calculation
-                volatility_score = 1 / (1 + normalized_tr * 0.5)
-                gap_score = 1 - overnight_gap_flag * 0.3
-                day_score = 1.1 if day_of_week in [1, 2] else 0.9
-                
-                range_proxy = volatility_score * gap_score * day_score * 0.4
-                range_proxy = np.clip(range_proxy, 0, 1)
-                
-                data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'symbol': symbol,
-                    'open': round(open_price, 2),
-                    'high': round(high_price, 2),
-                    'low': round(low_price, 2),
-                    'close': round(close_price, 2),
-                    'volume': int(volume),
-                    'true_range': round(true_range, 3),
-                    'atm_straddle': round(atm_straddle, 3),
-                    'normalized_tr': round(normalized_tr, 3),
-                    'overnight_gap_flag': overnight_gap_flag,
-                    'day_of_week': day_of_week,
-                    'range_proxy': round(range_proxy, 3),
-                    'is_chop_true': is_chop,
-                    'binary_up_true': binary_up,
-                    'chop_prob_raw': round(chop_prob, 3)
-                })
-                
-        return pd.DataFrame(data)
+        # Whole (day, symbol) grid at once: rows are day-major, symbol-minor
+        rng = np.random.default_rng(123)  # Different seed for "real" data
+        shape = (len(trading_days), len(symbols))
+        symbol_arr = np.array(symbols)
+        is_vix = symbol_arr == '^VIX'
+        
+        # Realistic S&P 500 levels around 4200-4400
+        base_price = np.where(
+            symbol_arr == '^GSPC', 4300 + rng.normal(0, 30, shape),
+            np.where(symbol_arr == 'ES=F', 4295 + rng.normal(0, 25, shape),
+                     18 + rng.exponential(3, shape))  # VIX
+        )
+        
+        # OHLC with realistic intraday movement
+        open_price = base_price + rng.normal(0, 5, shape)
+        high_price = open_price + rng.exponential(15, shape)
+        low_price = open_price - rng.exponential(12, shape)
+        close_price = open_price + rng.normal(0, 8, shape)
+        volume = rng.lognormal(15.5, 0.8, shape)
+        
+        # Features for CHOP detection
+        true_range = np.maximum.reduce([high_price - low_price,
+                                        np.abs(high_price - close_price),
+                                        np.abs(low_price - close_price)])
+        
+        atm_straddle = 0.018 * close_price  # Realistic ATM straddle
+        normalized_tr = true_range / atm_straddle
+        
+        overnight_gap = np.abs(open_price - close_price) / close_price
+        overnight_gap_flag = (overnight_gap > 0.004).astype(int)
+        
+        day_of_week = np.broadcast_to(np.array([d.weekday() for d in trading_days])[:, None], shape)
+        tue_wed = np.isin(day_of_week, [1, 2])
+        
+        # Ground truth based on realistic market patterns
+        # CHOP more likely: low normalized TR, Tuesday/Wednesday, low VIX
+        vix_factor = np.where(is_vix & (base_price < 22), 0.20, 0)
+        day_factor = np.where(tue_wed, 0.15, 0)  # Tue/Wed
+        vol_factor = -0.05 * np.maximum(0, normalized_tr - 1.0)
+        
+        chop_prob = np.clip(0.35 + vix_factor + day_factor + vol_factor, 0.1, 0.9)
+        
+        is_chop = rng.binomial(1, chop_prob)
+        binary_up = rng.binomial(1, 0.53, shape)  # Slight bull bias
+        
+        # Range proxy calculation
+        volatility_score = 1 / (1 + normalized_tr * 0.5)
+        gap_score = 1 - overnight_gap_flag * 0.3
+        day_score = np.where(tue_wed, 1.1, 0.9)
+        
+        range_proxy = np.clip(volatility_score * gap_score * day_score * 0.4, 0, 1)
+        
+        df = pd.DataFrame({
+            'date': np.repeat([d.strftime('%Y-%m-%d') for d in trading_days], len(symbols)),
+            'symbol': np.tile(symbols, len(trading_days)),
+            'open': open_price.ravel(),
+            'high': high_price.ravel(),
+            'low': low_price.ravel(),
+            'close': close_price.ravel(),
+            'volume': volume.ravel().astype(np.int64),
+            'true_range': true_range.ravel(),
+            'atm_straddle': atm_straddle.ravel(),
+            'normalized_tr': normalized_tr.ravel(),
+            'overnight_gap_flag': overnight_gap_flag.ravel(),
+            'day_of_week': day_of_week.ravel(),
+            'range_proxy': range_proxy.ravel(),
+            'is_chop_true': is_chop.ravel(),
+            'binary_up_true': binary_up.ravel(),
+            'chop_prob_raw': chop_prob.ravel()
+        })
+        
+        return df.round({'open': 2, 'high': 2, 'low': 2, 'close': 2,
+                         'true_range': 3, 'atm_straddle': 3, 'normalized_tr': 3,
+                         'range_proxy': 3, 'chop_prob_raw': 3})
     
     def run_chopguard_backtest(self, df):
         """Run ChopGuard v0.2 backtest on real cohort data"""
@@ -158,20 +171,9 @@ class RealCohortBacktest:
                               p_chop_raw, p_chop_cal, range_proxy, df):
         """Calculate final metrics on real cohort"""
         
-        # Confusion matrices
-        from sklearn.metrics import confusion_matrix, f1_score, precision_score, recall_score
-        
-        # Before metrics
-        cm_before = confusion_matrix(y_true, y_pred_before)
-        f1_before = f1_score(y_true, y_pred_before, zero_division=0)
-        precision_before = precision_score(y_true, y_pred_before, zero_division=0)
-        recall_before = recall_score(y_true, y_pred_before, zero_division=0)
-        
-        # After metrics
-        cm_after = confusion_matrix(y_true, y_pred_after)
-        f1_after = f1_score(y_true, y_pred_after, zero_division=0) 
-        precision_after = precision_score(y_true, y_pred_after, zero_division=0)
-        recall_after = recall_score(y_true, y_pred_after, zero_division=0)
+        # Before / after metrics (confusion matrix, precision, recall, F1)
+        cm_before, precision_before, recall_before, f1_before = _binary_metrics(y_true, y_pred_before)
+        cm_after, precision_after, recall_after, f1_after = _binary_metrics(y_true, y_pred_after)
         
         # Binary accuracy (simulated realistic performance)
         binary_acc = 86.8  # Slightly above threshold requirement
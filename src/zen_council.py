@@ -142,6 +142,20 @@ class ZenCouncil:
         
         return result
     
+    def adjust_forecasts(self, p_baselines):
+        """Vectorized p_final for many baselines (calibration/miss-tag inputs computed once)"""
+        hits, misses, _ = self.get_calibration_data()
+        p_cal = self.compute_calibration_prob(hits, misses)
+        miss_tag_adj, _ = self.compute_miss_tag_adjustment(self.get_miss_tag_rates())
+        
+        p_1 = self.blend_lambda * np.asarray(p_baselines, dtype=float) + (1 - self.blend_lambda) * p_cal
+        
+        # The vol guard doesn't move p_final, but adjust_forecast reseeds the global RNG through it;
+        # keep that side effect so callers' later np.random draws (e.g. straddle-gap noise) match
+        self.get_volatility_metrics()
+        
+        return np.clip(miss_tag_adj * p_1, 0.05, 0.95)
+    
     def write_explanation(self, result, output_dir):
         """Write ZEN_COUNCIL_EXPLAIN.md artifact"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -0,0 +1,93 @@
+"""
+Unit tests for news corroboration clustering
+Reworded headlines from a trusted source corroborate low-trust items; distinct stories do not
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from news_ingestion import NewsIngestionEngine
+
+# (low-trust headline, trusted headline) reporting the same story
+PARAPHRASED_PAIRS = [
+    ("Fed holds rates steady as inflation cools", "Fed keeps rates steady as inflation cools"),
+    ("Treasury announces new bond issuance schedule", "Treasury unveils new bond issuance schedule"),
+    ("Market manipulation alleged in trading scandal", "Market manipulation alleged in major trading scandal"),
+    ("Federal Reserve announces interest rate decision after two-day meeting",
+     "Federal Reserve announces interest rate decision, signals cuts ahead"),
+    ("Oil prices slump on weak China demand data", "Oil prices slump on weak Chinese demand data"),
+    ("Stocks rally as jobs report beats forecasts", "Stocks rally after jobs report beats forecasts"),
+    ("US inflation rises 3.2% in September, above expectations",
+     "U.S. inflation rises 3.2% in September, above expectations"),
+    ("Apple shares fall after iPhone sales miss estimates", "Apple shares fall as iPhone sales miss estimates"),
+]
+
+# (low-trust headline, trusted headline) reporting different stories
+DISTINCT_PAIRS = [
+    ("Market manipulation alleged in trading scandal", "Market volatility increases amid uncertainty"),
+    ("Insider sources claim major policy change", "Central bank signals policy shift"),
+    ("Stocks rally as jobs report beats forecasts",
+     "Stocks slide as jobs report misses forecasts badly, yields plunge"),
+    ("Oil prices slump on weak China demand data", "Oil prices jump as OPEC extends supply cuts"),
+    ("Federal Reserve announces interest rate decision after two-day meeting",
+     "Federal Reserve announces new bank capital rules for lenders"),
+    ("Apple shares fall after iPhone sales miss estimates", "Microsoft shares rise after cloud sales beat estimates"),
+]
+
+
+def _item(headline, low_trust):
+    return {'headline': headline, 'source': 'rumors.com' if low_trust else 'reuters.com',
+            'requires_corroboration': low_trust}
+
+
+class TestNewsCorroboration(unittest.TestCase):
+    """Test suite for headline clustering in _check_corroboration"""
+    
+    def setUp(self):
+        # Config files are not needed to cluster headlines (missing ones fall back to defaults)
+        missing = os.path.join(os.path.dirname(__file__), 'missing')
+        self.engine = NewsIngestionEngine(os.path.join(missing, 'whitelist.md'), os.path.join(missing, 'weights.yaml'))
+    
+    def _low_trust_result(self, low_trust_headline, trusted_headline):
+        items = [_item(low_trust_headline, True), _item(trusted_headline, False)]
+        results = list(self.engine._check_corroboration(items))
+        self.assertEqual(len(results), 2)
+        return next(item for item in results if item['requires_corroboration'])
+    
+    def test_paraphrased_headlines_corroborate(self):
+        """A reworded trusted headline corroborates the low-trust item"""
+        for low_trust_headline, trusted_headline in PARAPHRASED_PAIRS:
+            with self.subTest(headline=low_trust_headline):
+                item = self._low_trust_result(low_trust_headline, trusted_headline)
+                self.assertTrue(item['corroborated'])
+                self.assertNotIn('status', item)
+    
+    def test_distinct_stories_do_not_corroborate(self):
+        """A different story, even one sharing words or a prefix, leaves the low-trust item muted"""
+        for low_trust_headline, trusted_headline in DISTINCT_PAIRS:
+            with self.subTest(headline=low_trust_headline):
+                item = self._low_trust_result(low_trust_headline, trusted_headline)
+                self.assertFalse(item['corroborated'])
+                self.assertEqual(item['status'], 'MUTED')
+    
+    def test_clusters_mixed_batch(self):
+        """Each low-trust item is matched only to its own story within one batch"""
+        items = [_item(a, True) for a, _ in PARAPHRASED_PAIRS[:3]] + \
+                [_item(b, False) for _, b in PARAPHRASED_PAIRS[:2]] + \
+                [_item("Economic data shows mixed signals", False)]
+        results = list(self.engine._check_corroboration(items))
+        self.assertEqual(len(results), len(items))
+        corroborated = {item['headline']: item['corroborated'] for item in results if item['requires_corroboration']}
+        self.assertEqual(corroborated, {
+            PARAPHRASED_PAIRS[0][0]: True,
+            PARAPHRASED_PAIRS[1][0]: True,
+            PARAPHRASED_PAIRS[2][0]: False,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()